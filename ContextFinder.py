@@ -1,36 +1,56 @@
 import json
 
 import json_manager
+from MentionPostings import MentionPostings
 from Person import Person
 from Processor import Processor
 from SequenceCounter import SequenceCounter
+from SuffixArray import SuffixArray
 
 
 class ContextFinder:
     def __init__(self, preprocessed_flag, name_file=None, sentence_file=None, words_to_remove_file_path=None,
-                 preprocessed_json_file_path=None):
+                 preprocessed_json_file_path=None, suffix_array=False):
+        # With suffix_array set, the sequences of each person's sentences are listed from a suffix array of all the
+        # sentences, built once.
+        self.use_suffix_array = suffix_array
         if preprocessed_flag:
             # Unpacks the sentences and people from the json that is in the same format as task 1
-            preprocessed_json = json_manager.load_json_file(preprocessed_json_file_path)
+            preprocessed_json = json_manager.load_preprocessed_file(preprocessed_json_file_path)
             self.sentences = preprocessed_json["Question 1"]["Processed Sentences"]
             self.persons = preprocessed_json["Question 1"]["Persons"]
+        elif Processor.cache is not None:
+            # Reuses the sentences and persons cleaned by a previous run on the same files.
+            self.sentences, self.persons = Processor.load_from_cache(sentence_file, name_file, words_to_remove_file_path)
         else:
             # Executes the preprocessing cleaning procedure and sets the variables needed (sentences and persons)
-            words_to_remove = Processor.read_csv_file(words_to_remove_file_path)
+            words_to_remove = Processor.read_text_cleaner(words_to_remove_file_path)
             self.sentences = Processor.read_csv_file(sentence_file, words_to_remove)
-            Processor.clean_sentences(self.sentences, words_to_remove)
-            self.persons = Processor.read_csv_file(name_file)
-            for person in self.persons:
-                person.clean(words_to_remove)
+            self.sentences = Processor.clean_sentences(self.sentences, words_to_remove)
+            self.persons = Processor.clean_names(Processor.read_csv_file(name_file), words_to_remove)
+        # Sentences mentioning each person, found once instead of searching every sentence for every person.
+        input_file_paths = (preprocessed_json_file_path, None, None) if preprocessed_flag else \
+            (sentence_file, name_file, words_to_remove_file_path)
+        self.mention_postings = Processor.get_mention_postings(self.sentences, self.persons, input_file_paths)
+        self.person_indices = {person: index for index, person in enumerate(self.persons)}
+        self.suffix_array = SuffixArray.from_sentences(self.sentences) if suffix_array else None
+        # Each sentence also carries the persons it mentions, taken from the postings.
+        self.sentences = Processor.set_mentions(self.sentences, self.persons, self.mention_postings)
 
     # Function returns all sequences related to a person.
     def find_context(self, person: Person, max_length: int) -> list:
         relevant_sequences = []
-        sentences = []
         # Find all sentences that contain the person
-        for sentence in self.sentences:
-            if sentence.check_if_person_in_sentence(person):
-                sentences.append(sentence)
+        if person in self.person_indices:
+            sentence_indices = list(self.mention_postings.get_sentence_indices(self.person_indices[person]))
+        else:
+            # The mentions of the sentences are only of the known persons, so other persons are searched for.
+            sentence_indices = list(MentionPostings.build(self.sentences, [person]).get_sentence_indices(0))
+
+        if self.use_suffix_array:
+            # The suffix array lists the unique sequences of the sentences already sorted.
+            return list(self.suffix_array.iterate_distinct_sequences_of(sentence_indices, max_length))
+        sentences = [self.sentences[index] for index in sentence_indices]
 
         # Add all unique sequences to the relevant_sequences list that are at most of length max_length
         for i in range(1, max_length + 1):
@@ -0,0 +1,89 @@
+from array import array
+
+from SentenceView import SentenceView
+from Vocabulary import Vocabulary
+
+
+class Corpus:
+    # Type code of the offsets array (signed long long), token ids use Vocabulary.TYPECODE.
+    OFFSET_TYPECODE = 'q'
+
+    # tokens holds the token ids of all the sentences one after the other, and sentence i spans
+    # tokens[offsets[i]:offsets[i + 1]] (CSR layout). Both can be any buffer of the right type, such as arrays or
+    # memoryviews over a memory-mapped file.
+    def __init__(self, vocabulary, tokens, offsets):
+        self.vocabulary = vocabulary
+        self.tokens = memoryview(tokens)
+        self.offsets = memoryview(offsets)
+        # Corpus file the buffers are mapped from, if any (set by CorpusFile).
+        self.corpus_file = None
+
+    # Builds a corpus from cleaned sentences (or any data with a word_list), interning their words in the vocabulary.
+    @staticmethod
+    def from_sentences(sentences, vocabulary=None):
+        return Corpus.from_word_lists((sentence.word_list for sentence in sentences), vocabulary)
+
+    # Builds a corpus from the word lists of the sentences, interning the words in the vocabulary.
+    @staticmethod
+    def from_word_lists(word_lists, vocabulary=None):
+        if vocabulary is None:
+            vocabulary = Vocabulary()
+        tokens = array(Vocabulary.TYPECODE)
+        offsets = array(Corpus.OFFSET_TYPECODE, [0])
+        for word_list in word_lists:
+            tokens.extend(vocabulary.encode(word_list))
+            offsets.append(len(tokens))
+        return Corpus(vocabulary, tokens, offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    # An index returns a view of the sentence, a slice returns a corpus sharing the same buffers (no copy).
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("corpus slices must be contiguous")
+            stop = max(start, stop)
+            return Corpus(self.vocabulary, self.tokens, self.offsets[start:stop + 1])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("sentence index out of range")
+        return SentenceView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield SentenceView(self, index)
+
+    # Function returns the token ids of sentence at index without copying them.
+    def token_ids(self, index):
+        return self.tokens[self.offsets[index]:self.offsets[index + 1]]
+
+    # Function returns the words of every sentence, used when writing the corpus as JSON.
+    def word_lists(self):
+        return [self.vocabulary.decode(self.token_ids(index)) for index in range(len(self))]
+
+    # Function returns a corpus owning arrays with only the tokens this corpus refers to, offsets starting at 0.
+    def compact(self):
+        start, end = self.offsets[0], self.offsets[-1]
+        tokens = array(Vocabulary.TYPECODE, self.tokens[start:end])
+        offsets = array(Corpus.OFFSET_TYPECODE, (offset - start for offset in self.offsets))
+        return Corpus(self.vocabulary, tokens, offsets)
+
+    # Function releases the buffers of the corpus. A corpus read from a corpus file also unmaps the file.
+    def close(self) -> None:
+        if self.corpus_file is not None:
+            self.corpus_file.close()
+        else:
+            self.release()
+
+    # Function releases the views of the corpus over its buffers, the corpus can't be used afterwards.
+    def release(self) -> None:
+        self.tokens.release()
+        self.offsets.release()
+
+    # Memoryviews can't be pickled, so the corpus is sent to other processes as compact arrays.
+    def __reduce__(self):
+        compacted = self.compact()
+        return Corpus, (self.vocabulary, compacted.tokens.obj, compacted.offsets.obj)
@@ -0,0 +1,147 @@
+import mmap
+import struct
+import sys
+from array import array
+
+from Corpus import Corpus
+from Person import Person
+from Vocabulary import Vocabulary
+
+
+class CorpusFile:
+    # Binary preprocessed corpus, an alternative to the Task 1 JSON that is memory-mapped instead of parsed.
+    # Layout, every section starting at a multiple of ALIGNMENT bytes:
+    #   header
+    #   vocabulary       utf-8 tokens separated by newlines, token id i is line i
+    #   tokens           int32 token ids of all the sentences
+    #   offsets          int64 sentence boundaries in tokens (CSR, number of sentences + 1)
+    #   name tokens      int32 token ids of all the names and nicknames
+    #   name offsets     int64 boundaries of each name or nickname in name tokens
+    #   person offsets   int64 boundaries of each person in names, a person's first name is the real name and the rest
+    #                    are its nicknames
+    MAGIC = b"IFPCORP\x00"
+    VERSION = 1
+    # magic, version, byte order (1 for little endian), vocabulary size in bytes and the length of each array.
+    HEADER = struct.Struct("<8sII6Q")
+    ALIGNMENT = 8
+
+    # Function checks if the file is a binary corpus file by its magic bytes.
+    @staticmethod
+    def is_corpus_file(file_path) -> bool:
+        try:
+            with open(file_path, 'rb') as file:
+                return file.read(len(CorpusFile.MAGIC)) == CorpusFile.MAGIC
+        except OSError:
+            return False
+
+    # Function writes the sentences corpus and the processed names (in the Task 1 format, a list of
+    # [real name words, [nickname words, ...]]) to a binary corpus file.
+    @staticmethod
+    def write(file_path, corpus, processed_names) -> None:
+        corpus = corpus.compact()
+        vocabulary = corpus.vocabulary
+        name_tokens = array(Vocabulary.TYPECODE)
+        name_offsets = array(Corpus.OFFSET_TYPECODE, [0])
+        person_offsets = array(Corpus.OFFSET_TYPECODE, [0])
+        for real_name, nicknames in processed_names:
+            for name in [real_name] + nicknames:
+                name_tokens.extend(vocabulary.encode(name))
+                name_offsets.append(len(name_tokens))
+            person_offsets.append(len(name_offsets) - 1)
+
+        vocabulary_bytes = "\n".join(vocabulary.tokens).encode("utf-8")
+        sections = [vocabulary_bytes, corpus.tokens.obj, corpus.offsets.obj, name_tokens, name_offsets, person_offsets]
+        header = CorpusFile.HEADER.pack(CorpusFile.MAGIC, CorpusFile.VERSION, sys.byteorder == "little",
+                                        len(vocabulary_bytes), len(corpus.tokens), len(corpus.offsets),
+                                        len(name_tokens), len(name_offsets), len(person_offsets))
+        with open(file_path, 'wb') as file:
+            file.write(header)
+            CorpusFile.write_sections(file, sections)
+
+    # Function writes the sections (bytes or arrays) one after the other, each starting at a multiple of ALIGNMENT.
+    @staticmethod
+    def write_sections(file, sections) -> None:
+        for section in sections:
+            file.write(b"\0" * (-file.tell() % CorpusFile.ALIGNMENT))
+            file.write(section if isinstance(section, bytes) else section.tobytes())
+
+    # Function returns views of the sections written by write_sections after position in the buffer, cast to their
+    # type codes.
+    @staticmethod
+    def read_sections(buffer, position, typecodes, lengths) -> list:
+        sections = []
+        for typecode, length in zip(typecodes, lengths):
+            position += -position % CorpusFile.ALIGNMENT
+            size = length * array(typecode).itemsize
+            sections.append(buffer[position:position + size].cast(typecode))
+            position += size
+        return sections
+
+    # Memory-maps a binary corpus file and reads the sentences corpus and the processed names from it. The token arrays
+    # are views over the mapped file, so nothing is read until it is used. The file stays mapped until close (also
+    # called by the corpus' close and at the end of a with block), which needs every sentence view and slice of the
+    # corpus to be gone.
+    def __init__(self, file_path):
+        with open(file_path, 'rb') as file:
+            self.mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self.mapping)
+        magic, version, little_endian, vocabulary_size, *lengths = CorpusFile.HEADER.unpack_from(self.buffer)
+        if magic != CorpusFile.MAGIC or version != CorpusFile.VERSION:
+            self.close()
+            raise ValueError("unsupported corpus file")
+        if bool(little_endian) != (sys.byteorder == "little"):
+            self.close()
+            raise ValueError("corpus file was written with a different byte order")
+
+        typecodes = ["B", Vocabulary.TYPECODE, Corpus.OFFSET_TYPECODE, Vocabulary.TYPECODE, Corpus.OFFSET_TYPECODE,
+                     Corpus.OFFSET_TYPECODE]
+        self.sections = CorpusFile.read_sections(self.buffer, CorpusFile.HEADER.size, typecodes,
+                                                 [vocabulary_size] + lengths)
+        vocabulary_bytes, tokens, offsets, name_tokens, name_offsets, person_offsets = self.sections
+
+        vocabulary = Vocabulary(bytes(vocabulary_bytes).decode("utf-8").split("\n") if vocabulary_size else [])
+        names = Corpus(vocabulary, name_tokens, name_offsets)
+        name_word_lists = names.word_lists()
+        names.release()
+        self.processed_names = [[name_word_lists[person_offsets[i]],
+                                 name_word_lists[person_offsets[i] + 1:person_offsets[i + 1]]]
+                                for i in range(len(person_offsets) - 1)]
+        self.corpus = Corpus(vocabulary, tokens, offsets)
+        self.corpus.corpus_file = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # Function releases the views over the mapped file and unmaps it.
+    def close(self) -> None:
+        if self.mapping.closed:
+            return
+        if hasattr(self, "corpus"):
+            self.corpus.release()
+        for section in getattr(self, "sections", []):
+            section.release()
+        self.buffer.release()
+        self.mapping.close()
+
+    # Function memory-maps a binary corpus file and returns the sentences corpus and the processed names. The file is
+    # unmapped by the corpus' close, or once the corpus is no longer used.
+    @staticmethod
+    def read(file_path):
+        corpus_file = CorpusFile(file_path)
+        return corpus_file.corpus, corpus_file.processed_names
+
+    # Function loads a binary corpus file as a document shaped like the Task 1 JSON, with the sentences as a corpus of
+    # sentence views and the names also given as cleaned Person objects.
+    @staticmethod
+    def load_document(file_path) -> dict:
+        corpus, processed_names = CorpusFile.read(file_path)
+        return {
+            "Question 1": {
+                "Processed Sentences": corpus,
+                "Processed Names": processed_names,
+                "Persons": [Person.from_word_lists(real_name, nicknames) for real_name, nicknames in processed_names]
+            }
+        }
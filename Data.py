@@ -1,12 +1,96 @@
 import re
 
+from TextCleaner import TextCleaner
+
 
 class Data:
-    def __init__(self, data):
+    # Slots instead of a per-instance __dict__, there is one Data per sentence, name and nickname.
+    __slots__ = ('data', '_word_list', '_cleaned_data', 'token_ids', 'vocabulary', 'max_sequence_length',
+                 '_sequence_list')
+
+    # Whether the original data string is kept after cleaning. Compact subclasses drop it, it is not needed once the
+    # data is cleaned.
+    KEEP_SOURCE = True
+
+    def __init__(self, data, max_sequence_length=None):
         self.data = data
         self.word_list = None
         self.cleaned_data = data
-        self.sequence_list = []
+        # Token ids of the words in the vocabulary, set once the data is encoded.
+        self.token_ids = None
+        self.vocabulary = None
+        # Longest sequence length generated by sequence_list, None means no bound.
+        self.max_sequence_length = max_sequence_length
+        # Sequences are only generated when first requested, see the sequence_list property.
+        self._sequence_list = None
+
+    # List of the words of the cleaned data. Once the data is encoded it is rebuilt from the token ids on access.
+    @property
+    def word_list(self):
+        if self._word_list is None and self.token_ids is not None:
+            return self.vocabulary.decode(self.token_ids)
+        return self._word_list
+
+    @word_list.setter
+    def word_list(self, word_list) -> None:
+        self._word_list = word_list
+
+    # The cleaned data as a string. Once the data is encoded it is rebuilt from the token ids on access.
+    @property
+    def cleaned_data(self) -> str:
+        if self._cleaned_data is None and self.token_ids is not None:
+            return " ".join(self.word_list)
+        return self._cleaned_data
+
+    @cleaned_data.setter
+    def cleaned_data(self, cleaned_data: str) -> None:
+        self._cleaned_data = cleaned_data
+
+    # Function interns the words in the vocabulary and keeps only the compact array of their ids, the words and the
+    # cleaned string are rebuilt from it when needed.
+    def encode(self, vocabulary) -> None:
+        self.token_ids = vocabulary.encode(self.word_list or [])
+        self.vocabulary = vocabulary
+        self._word_list = None
+        self._cleaned_data = None
+        self._sequence_list = None
+
+    # List of all the sequences of consecutive words in the data, generated lazily on first access and bounded by
+    # max_sequence_length.
+    @property
+    def sequence_list(self) -> list:
+        if self._sequence_list is None:
+            if not self.word_list:
+                return []
+            self._sequence_list = list(self.iterate_sequences())
+        return self._sequence_list
+
+    @sequence_list.setter
+    def sequence_list(self, sequence_list: list) -> None:
+        self._sequence_list = sequence_list
+
+    # Sets the longest sequence length generated by sequence_list and drops the sequences generated so far.
+    def set_max_sequence_length(self, max_sequence_length) -> None:
+        self.max_sequence_length = max_sequence_length
+        self._sequence_list = None
+
+    # Generator yielding the sequences of every length from 1 up to max_length (or max_sequence_length if not given)
+    # one length at a time, without keeping them in memory.
+    def iterate_sequences(self, max_length=None):
+        word_list = self.word_list
+        if not word_list:
+            return
+        if max_length is None:
+            max_length = self.max_sequence_length
+        longest = len(word_list) if max_length is None else min(max_length, len(word_list))
+        for seq_length in range(1, longest + 1):
+            yield from self.create_sequence_list(seq_length, word_list)
+
+    # Function checks if the sequence appears in the data, generating only the sequences of the same length.
+    def contains_sequence(self, sequence: str) -> bool:
+        if self._sequence_list is not None:
+            return sequence in self._sequence_list
+        return sequence in self.create_sequence_list(len(sequence.split()))
 
     # Turn all inputs to lowercase
     def convert_to_lowercase(self) -> None:
@@ -35,44 +119,50 @@ class Data:
 
     # Iterates over sentence and checks if sequence exists in sentence
     def count_sequence_in_sequence_list(self, sequence:str) -> int:
-        return sum(1 for sequence_to_check in self.sequence_list if sequence == sequence_to_check)
+        if self._sequence_list is None:
+            return self.create_sequence_list(len(sequence.split())).count(sequence)
+        return sum(1 for sequence_to_check in self._sequence_list if sequence == sequence_to_check)
 
     # Function removes whitespace at the beginning and at the end of the sentence
     def remove_whitespace_suffix_and_prefix(self) -> None:
         self.cleaned_data = self.cleaned_data.lstrip().rstrip()
 
     # Function executes all cleaning functions on the inputted data.
+    # unwanted_words may be a list of words or a TextCleaner shared between many items, which avoids rebuilding the
+    # unwanted words set for every item.
     def clean(self, unwanted_words=None) -> None:
-        # If data is empty
-        if not self.data.strip():
-            self.cleaned_data = ""
-            self.word_list = []
-            self.sequence_list = []
-            return
-
-        # Execute cleaning functions.
-        self.convert_to_lowercase()
-        self.remove_punctuation()
-        self.remove_unwanted_words(unwanted_words)
-        self.remove_consecutive_whitespaces()
-        self.remove_whitespace_suffix_and_prefix()
-
-        # No need to continue procedure if cleaned data is empty.
-        if not self.cleaned_data:
-            self.word_list = []
-            self.sequence_list = []
-            return
+        # Data that dropped its source after a previous cleaning is cleaned again from the cleaned string.
+        source = self.data if self.data is not None else self.cleaned_data
+        # Lowercase, remove punctuation and unwanted words and split to words in a single pass.
+        self.set_words(TextCleaner.create(unwanted_words).tokenize(source))
 
-        # Create word list
-        self.split_data_to_words()
+    # Function sets the cleaned words of the data. Used by clean and for data cleaned elsewhere (e.g. in a worker
+    # process).
+    def set_words(self, word_list: list) -> None:
+        self.word_list = word_list
+        self.cleaned_data = " ".join(word_list)
+        self.token_ids = None
+        # Sequences are generated on demand from the word list.
+        self._sequence_list = None
+        if not self.KEEP_SOURCE:
+            self.data = None
 
-        # Find all sequences
-        for i in range(1, len(self.word_list) + 1):
-            self.sequence_list.extend(self.create_sequence_list(i))
+    # Creates an instance directly from already cleaned words, without cleaning anything.
+    @classmethod
+    def from_words(cls, word_list: list):
+        data = cls.__new__(cls)
+        Data.__init__(data, None)
+        data.set_words(word_list)
+        return data
 
     # Function takes input with the length of sequence requested and returns a list of sequences of consecutive words with that length
-    def create_sequence_list(self, seq_length: int) -> list:
+    # word_list may be passed by callers that already hold it, to avoid decoding encoded data once per length.
+    def create_sequence_list(self, seq_length: int, word_list=None) -> list:
         sequence_list = []
-        for i in range(len(self.word_list) - seq_length + 1):
-            sequence_list.append(" ".join(self.word_list[i:i + seq_length]))
+        if word_list is None:
+            word_list = self.word_list
+        if not word_list or seq_length < 1:
+            return sequence_list
+        for i in range(len(word_list) - seq_length + 1):
+            sequence_list.append(" ".join(word_list[i:i + seq_length]))
         return sequence_list
@@ -3,30 +3,42 @@ import json
 import json_manager
 from Node import Node
 from Processor import Processor
-from SentenceWindow import SentenceWindow
 
 
 class DirectNeighborsFinder:
+    # sentences and persons may be given by a caller that already loaded them (IndirectConnectionFinder), the files are
+    # then only used as the cache key of the mention postings.
     def __init__(self, preprocessed_flag, window_size, threshold, name_file=None, sentence_file=None,
-                 words_to_remove_file_path=None, preprocessed_json_file_path=None):
+                 words_to_remove_file_path=None, preprocessed_json_file_path=None, sentences=None, persons=None):
         self.adjacency_list = {}
-        if preprocessed_flag:
+        if sentences is not None:
+            self.sentences = sentences
+        elif preprocessed_flag:
             # Unpacks the sentences and people from the json that is in the same format as task 1
-            preprocessed_json = json_manager.load_json_file(preprocessed_json_file_path)
+            preprocessed_json = json_manager.load_preprocessed_file(preprocessed_json_file_path)
             self.sentences = preprocessed_json["Question 1"]["Processed Sentences"]
             persons = preprocessed_json["Question 1"]["Persons"]
+        elif Processor.cache is not None:
+            # Reuses the sentences and persons cleaned by a previous run on the same files.
+            self.sentences, persons = Processor.load_from_cache(sentence_file, name_file, words_to_remove_file_path)
         else:
             # Executes the preprocessing cleaning procedure and sets the variables needed (sentences and persons)
-            words_to_remove = Processor.read_csv_file(words_to_remove_file_path)
+            words_to_remove = Processor.read_text_cleaner(words_to_remove_file_path)
             self.sentences = Processor.read_csv_file(sentence_file, words_to_remove)
-            Processor.clean_sentences(self.sentences, words_to_remove)
-            persons = Processor.read_csv_file(name_file)
-            for person in persons:
-                person.clean(words_to_remove)
+            self.sentences = Processor.clean_sentences(self.sentences, words_to_remove)
+            persons = Processor.clean_names(Processor.read_csv_file(name_file), words_to_remove)
+        # Sentences mentioning each person, found once instead of searching every sentence for every person.
+        input_file_paths = (preprocessed_json_file_path, None, None) if preprocessed_flag else \
+            (sentence_file, name_file, words_to_remove_file_path)
+        self.mention_postings = Processor.get_mention_postings(self.sentences, persons, input_file_paths)
+        self.person_indices = {person: index for index, person in enumerate(persons)}
+        # Each sentence also carries the persons it mentions, so sentence windows look them up instead of searching.
+        self.sentences = Processor.set_mentions(self.sentences, persons, self.mention_postings)
 
         # Sets instance variables.
         self.window_size = window_size
         self.threshold = threshold
+        # Maps each person to the set of start indices of the sentence windows the person is in.
         self.person_windows_dict = {}
         self.person_to_node = {}
         # Creates person nodes
@@ -40,15 +52,12 @@ class DirectNeighborsFinder:
             self.adjacency_list[person] = []
             self.person_to_node[person] = Node(person)
 
-    # Function iterates over each person and finds all sentence windows the person is in.
+    # Function iterates over each person and finds all sentence windows the person is in, from the sentences that
+    # mention the person.
     def find_windows_person_in(self):
         for person in self.adjacency_list.keys():
-            sentence_windows = []
-            # Iterate over all windows and add window to list of windows if person is found in it.
-            for i in range(len(self.sentences) - self.window_size + 1):
-                sentence_window = SentenceWindow(self.sentences[i:i + self.window_size])
-                if sentence_window.find_person_in_window(person):
-                    sentence_windows.append(sentence_window)
+            sentence_windows = self.mention_postings.get_window_starts(self.person_indices[person], self.window_size,
+                                                                       len(self.sentences))
             # No need to add person to dictionary if he is not found in any windows.
             if len(sentence_windows) > 0:
                 self.person_windows_dict[person] = sentence_windows
@@ -63,11 +72,8 @@ class DirectNeighborsFinder:
                 node_to_check = self.person_to_node[person_to_check]
                 # Make sure not to check against oneself.
                 if not node_to_check == node:
-                    similar_windows = 0
                     # Check how many of the persons sentence windows contain the other person.
-                    for sentence_window in self.person_windows_dict[person]:
-                        if sentence_window.find_person_in_window(node_to_check.payload):
-                            similar_windows += 1
+                    similar_windows = len(self.person_windows_dict[person] & self.person_windows_dict[person_to_check])
                     # If the amount of windows is at least the threshold, create the connection.
                     if similar_windows >= self.threshold:
                         if not node.check_node_is_neighbor(node_to_check):
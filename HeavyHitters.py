@@ -0,0 +1,66 @@
+import heapq
+
+
+class HeavyHitters:
+    # Space-Saving summary of the most frequent items of a stream, using memory for at most capacity items.
+    # After N items were added:
+    #   - every item with a true count above N / capacity is tracked,
+    #   - the count of a tracked item is never below its true count and overestimates it by at most errors[item],
+    #     which is itself at most N / capacity.
+    # With at most capacity distinct items in the stream the counts are exact.
+    DEFAULT_CAPACITY = 10000
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        # Number of items added so far (N).
+        self.total = 0
+        self.counts = {}
+        self.errors = {}
+        # Min-heap of (count, item) entries. Entries whose count is no longer the item's count are stale and skipped,
+        # the heap is rebuilt when they pile up.
+        self._heap = []
+
+    # Function adds an occurrence of the item. When the summary is full the item with the smallest count is replaced,
+    # and the new item inherits that count as its error.
+    def add(self, item, count=1) -> None:
+        self.total += count
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            minimum_count, minimum_item = self.pop_minimum()
+            del self.counts[minimum_item]
+            del self.errors[minimum_item]
+            self.counts[item] = minimum_count + count
+            self.errors[item] = minimum_count
+        heapq.heappush(self._heap, (self.counts[item], item))
+        if len(self._heap) > 2 * self.capacity:
+            self._heap = [(item_count, heap_item) for heap_item, item_count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    # Function adds every item of the iterable.
+    def update(self, items) -> None:
+        for item in items:
+            self.add(item)
+
+    # Function removes and returns the (count, item) entry of the tracked item with the smallest count.
+    def pop_minimum(self):
+        while True:
+            item_count, item = heapq.heappop(self._heap)
+            if self.counts.get(item) == item_count:
+                return item_count, item
+
+    # Largest possible overestimation of any count, N / capacity.
+    def error_bound(self) -> float:
+        return self.total / self.capacity
+
+    # Function returns the (item, count) pairs of the top_k largest counts (all of them if top_k is None) with a count
+    # of at least min_count, by decreasing count and then by item.
+    def most_common(self, top_k=None, min_count=1) -> list:
+        items = sorted((pair for pair in self.counts.items() if pair[1] >= min_count),
+                       key=lambda pair: (-pair[1], pair[0]))
+        return items if top_k is None else items[:top_k]
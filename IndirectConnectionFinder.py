@@ -3,11 +3,16 @@ import json
 import json_manager
 from collections import deque
 
+from LruCache import LruCache
 from Processor import Processor
 from DirectNeighborsFinder import DirectNeighborsFinder
 
 
 class IndirectConnectionFinder:
+    # Whether pairs of persons are connected, shared by all the finders. Off by default, a one-off run rarely checks the
+    # same pair twice.
+    result_cache = None
+
     def __init__(self, preprocessed_flag, people_connections_path, maximal_distance=None, window_size=None,
                  threshold=None,
                  name_file=None, sentence_file=None,
@@ -19,19 +24,24 @@ class IndirectConnectionFinder:
             preprocessed_json = json_manager.load_json_file(preprocessed_json_file_path)
             self.connections = preprocessed_json['Question 6']["Pair Matches"]
 
+        elif Processor.cache is not None:
+            # Reuses the sentences and persons cleaned by a previous run on the same files.
+            self.sentences, persons = Processor.load_from_cache(sentence_file, name_file, words_to_remove_file_path)
         else:
-            words_to_remove = Processor.read_csv_file(words_to_remove_file_path)  # Read words to remove from text.
+            words_to_remove = Processor.read_text_cleaner(words_to_remove_file_path)  # Read words to remove from text.
             self.sentences = Processor.read_csv_file(sentence_file, words_to_remove)  # Read sentences from file.
-            Processor.clean_sentences(self.sentences, words_to_remove)  # Perform preprocessing on sentences.
+            self.sentences = Processor.clean_sentences(self.sentences, words_to_remove)  # Perform preprocessing on sentences.
 
-            persons = Processor.read_csv_file(name_file)  # Read people from name file.
-            for person in persons:
-                person.clean(words_to_remove)  # Clean names from unwanted words.
+            # Read people from name file, clean names from unwanted words and drop duplicate names.
+            persons = Processor.clean_names(Processor.read_csv_file(name_file), words_to_remove)
 
+        if not preprocessed_flag:
             # Initializes DirectNeighborsFinder to establish direct connections between people.
+            # The sentences and persons read above are reused, with their mention postings.
             self.neighbors_finder = DirectNeighborsFinder(False, window_size, threshold, name_file=name_file,
                                                           sentence_file=sentence_file,
-                                                          words_to_remove_file_path=words_to_remove_file_path)
+                                                          words_to_remove_file_path=words_to_remove_file_path,
+                                                          sentences=self.sentences, persons=persons)
             self.adjacency_list = self.restructure_adjacency_list()  # Convert connections into adjacency list format.
             self.restructure_adjacency_list()  # Ensures adjacency list is structured correctly.
 
@@ -39,8 +49,9 @@ class IndirectConnectionFinder:
                 "Pair Matches"]  # Fetch direct connections.
             self.person_to_node = {}  # Maps each person to their respective node in the graph.
 
-        self.people_connections = json_manager.load_json_file(people_connections_path)[
-            "keys"]  # Load input pairs of people to check.
+        # Load input pairs of people to check, if any (a server gets them with each request).
+        self.people_connections = json_manager.load_json_file(people_connections_path)["keys"] \
+            if people_connections_path is not None else []
         self.maximal_distance = maximal_distance  # Maximum distance for indirect connection search.
 
     # The adjacency list is returned such that the keys are nodes but the pairs are strings so the keys are switched to
@@ -53,8 +64,27 @@ class IndirectConnectionFinder:
 
         return adjacency_list
 
-    # Function uses algorithm BFS to find out if two people are indirectly connected.
+    # Every new adjacency list gets a new version, so results cached for another graph are not used. The adjacency list
+    # is replaced when the graph changes, never modified.
+    @property
+    def adjacency_list(self):
+        return self._adjacency_list
+
+    @adjacency_list.setter
+    def adjacency_list(self, adjacency_list) -> None:
+        self._adjacency_list = adjacency_list
+        self.graph_version = LruCache.new_version()
+
+    # Function finds out if two people are indirectly connected, from the result cache if the pair was checked before.
     def persons_indirectly_connected(self, person1, person2, maximum_distance):
+        if IndirectConnectionFinder.result_cache is None:
+            return self.search_indirect_connection(person1, person2, maximum_distance)
+        return IndirectConnectionFinder.result_cache.get_or_compute(
+            (self.graph_version, person1, person2, maximum_distance),
+            lambda: self.search_indirect_connection(person1, person2, maximum_distance))
+
+    # Function uses algorithm BFS to find out if two people are indirectly connected.
+    def search_indirect_connection(self, person1, person2, maximum_distance):
         if person1 == person2:
             return True  # Edge case where the connection is the same person.
 
@@ -78,12 +108,17 @@ class IndirectConnectionFinder:
                                   moves + 1))  # Add neighbor to queue with updated distance.
         return False  # Returns False if no path was found between the two persons.
 
-    def find_indirect_connections(self):
+    # Other pairs and maximal distance than the ones given to the constructor can be given.
+    def find_indirect_connections(self, people_connections=None, maximal_distance=None):
+        if people_connections is None:
+            people_connections = self.people_connections
+        if maximal_distance is None:
+            maximal_distance = self.maximal_distance
         pair_matches = []
         # Iterates over every inputted pair of people
-        for people_connection in self.people_connections:
+        for people_connection in people_connections:
             if self.persons_indirectly_connected(people_connection[0], people_connection[1],
-                                                 self.maximal_distance):  # Checks if they are connected
+                                                 maximal_distance):  # Checks if they are connected
                 pair_matches.append([sorted([people_connection[0], people_connection[1]])[0],
                                      sorted([people_connection[0], people_connection[1]])[1],
                                      True])  # If so add the sorted pair with True as the connection variable
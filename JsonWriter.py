@@ -0,0 +1,51 @@
+import json
+
+
+class JsonWriter:
+    # Writes JSON documents piece by piece instead of serializing the whole document into one string first. The output
+    # is the same as json.dumps with its default separators. Besides dicts and lists, any other iterable (e.g. a
+    # generator) in the document is written as a JSON array, so parts of the document can be computed while writing.
+
+    SCALARS = (str, int, float, bool, type(None))
+
+    # Generator yielding the JSON text of the value in pieces.
+    @staticmethod
+    def iterate_json(value):
+        if isinstance(value, dict):
+            yield "{"
+            for i, (key, item) in enumerate(value.items()):
+                yield (", " if i else "") + json.dumps(key if isinstance(key, str) else str(key)) + ": "
+                yield from JsonWriter.iterate_json(item)
+            yield "}"
+        elif isinstance(value, (list, tuple)) or JsonWriter.is_lazy_iterable(value):
+            yield "["
+            for i, item in enumerate(value):
+                if i:
+                    yield ", "
+                if JsonWriter.is_flat(item):
+                    # Small items, like a sentence's words, are serialized at once.
+                    yield json.dumps(item)
+                else:
+                    yield from JsonWriter.iterate_json(item)
+            yield "]"
+        else:
+            yield json.dumps(value)
+
+    # Function checks if the value is an iterable that json.dumps does not serialize, such as a generator.
+    @staticmethod
+    def is_lazy_iterable(value) -> bool:
+        return not isinstance(value, (str, bytes, dict, list, tuple)) and hasattr(value, "__iter__")
+
+    # Function checks if the value is a scalar or a list of scalars, which json.dumps serializes at once.
+    @staticmethod
+    def is_flat(value) -> bool:
+        if isinstance(value, (list, tuple)):
+            return all(isinstance(item, JsonWriter.SCALARS) for item in value)
+        return isinstance(value, JsonWriter.SCALARS)
+
+    # Function writes the JSON text of the value to the file followed by a newline, like print(json.dumps(value)).
+    @staticmethod
+    def write(value, file) -> None:
+        for piece in JsonWriter.iterate_json(value):
+            file.write(piece)
+        file.write("\n")
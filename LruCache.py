@@ -0,0 +1,78 @@
+import itertools
+from collections import OrderedDict
+
+
+class LruCache:
+    # Results of repeated queries, at most max_size of them, the least recently used ones evicted first. With size_of
+    # given, max_size bounds the sum of size_of of the results instead of their number (and a result larger than
+    # max_size is not stored).
+    # Keys start with the version of the data the result was computed from (see new_version), so results of data
+    # that changed since are never returned and simply age out.
+    # hits, misses and evictions count the lookups answered from the cache, the ones that weren't and the entries
+    # evicted.
+    DEFAULT_MAX_SIZE = 10000
+    # Source of the data versions, unique within the process.
+    _versions = itertools.count(1)
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, size_of=None):
+        if max_size < 1:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.size_of = size_of if size_of is not None else lambda value: 1
+        self.entries = OrderedDict()
+        # Sum of the sizes of the entries.
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Function returns a version no data had before, to be given to data whenever it changes.
+    @staticmethod
+    def new_version() -> int:
+        return next(LruCache._versions)
+
+    def __len__(self):
+        return len(self.entries)
+
+    # Function returns the result stored under the key, or default if there is none. Finding it marks it as recently
+    # used.
+    def get(self, key, default=None):
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        self.misses += 1
+        return default
+
+    # Function stores the result under the key and evicts the least recently used entries above max_size.
+    def put(self, key, value) -> None:
+        value_size = self.size_of(value)
+        if value_size > self.max_size:
+            return
+        if key in self.entries:
+            self.size -= self.size_of(self.entries.pop(key))
+        self.entries[key] = value
+        self.size += value_size
+        while self.size > self.max_size:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= self.size_of(evicted)
+            self.evictions += 1
+
+    # Function returns the result stored under the key, computing and storing it first if there is none.
+    def get_or_compute(self, key, compute):
+        if key in self.entries:
+            return self.get(key)
+        self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    # Function removes all the entries, the counters are kept.
+    def clear(self) -> None:
+        self.entries.clear()
+        self.size = 0
+
+    # Function returns the counters, the number of entries and their total size.
+    def stats(self) -> dict:
+        return {"entries": len(self.entries), "size": self.size, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions}
@@ -0,0 +1,107 @@
+import hashlib
+import struct
+import sys
+from array import array
+
+from NameMatcher import NameMatcher
+
+
+class MentionPostings:
+    # Which sentences mention which persons, built once per corpus and shared by the tasks working with persons.
+    # For every person (by position in the persons list) it holds the sorted indices of the sentences mentioning them
+    # and the number of mentions in each of these sentences (counted like Sentence.check_for_names). The postings of
+    # person i are sentence_indices[person_offsets[i]:person_offsets[i + 1]] (CSR layout), and the same for counts.
+    # Binary file layout: header, person offsets (int64), sentence indices (int64), counts (int32).
+    MAGIC = b"IFPMENT\x00"
+    VERSION = 1
+    # magic, version, byte order (1 for little endian) and the length of each array.
+    HEADER = struct.Struct("<8sII3Q")
+    INDEX_TYPECODE = 'q'
+    COUNT_TYPECODE = 'i'
+
+    def __init__(self, person_offsets, sentence_indices, counts):
+        self.person_offsets = person_offsets
+        self.sentence_indices = sentence_indices
+        self.counts = counts
+
+    # Builds the postings of the persons in a single pass over the sentences, which may be streamed.
+    @staticmethod
+    def build(sentences, persons):
+        name_matcher = NameMatcher(persons)
+        person_sentences = [[] for _ in persons]
+        person_counts = [[] for _ in persons]
+        for sentence_index, sentence in enumerate(sentences):
+            for person_index, count in name_matcher.count_mentions(sentence).items():
+                person_sentences[person_index].append(sentence_index)
+                person_counts[person_index].append(count)
+
+        person_offsets = array(MentionPostings.INDEX_TYPECODE, [0])
+        sentence_indices = array(MentionPostings.INDEX_TYPECODE)
+        counts = array(MentionPostings.COUNT_TYPECODE)
+        for sentence_list, count_list in zip(person_sentences, person_counts):
+            sentence_indices.extend(sentence_list)
+            counts.extend(count_list)
+            person_offsets.append(len(sentence_indices))
+        return MentionPostings(person_offsets, sentence_indices, counts)
+
+    # Function returns the cache key of the postings of the persons in the sentences of the inputs with input_key.
+    # Postings are by person index, so the key also changes with the names of the persons and their order.
+    @staticmethod
+    def create_cache_key(input_key, persons) -> str:
+        key = hashlib.sha256(input_key.encode("ascii"))
+        for person in persons:
+            names = [person.real_name.word_list or []] + [nickname.word_list or [] for nickname in person.nicknames]
+            key.update(("\t".join(" ".join(name) for name in names) + "\n").encode("utf-8"))
+        return key.hexdigest()
+
+    def __len__(self):
+        return len(self.person_offsets) - 1
+
+    # Function returns the sorted indices of the sentences mentioning the person.
+    def get_sentence_indices(self, person_index):
+        return self.sentence_indices[self.person_offsets[person_index]:self.person_offsets[person_index + 1]]
+
+    # Function returns the number of mentions of the person in each of their sentences.
+    def get_counts(self, person_index):
+        return self.counts[self.person_offsets[person_index]:self.person_offsets[person_index + 1]]
+
+    # Function returns the number of mentions of the person in all the sentences.
+    def total_mentions(self, person_index) -> int:
+        return sum(self.get_counts(person_index))
+
+    # Function returns the set of start indices of the windows of window_size consecutive sentences (out of
+    # sentence_count) containing a sentence that mentions the person.
+    def get_window_starts(self, person_index, window_size, sentence_count) -> set:
+        window_starts = set()
+        for sentence_index in self.get_sentence_indices(person_index):
+            window_starts.update(range(max(0, sentence_index - window_size + 1),
+                                       min(sentence_index, sentence_count - window_size) + 1))
+        return window_starts
+
+    # Function writes the postings to a binary file.
+    def write(self, file_path) -> None:
+        sections = [self.person_offsets, self.sentence_indices, self.counts]
+        header = MentionPostings.HEADER.pack(MentionPostings.MAGIC, MentionPostings.VERSION, sys.byteorder == "little",
+                                             *[len(section) for section in sections])
+        with open(file_path, 'wb') as file:
+            file.write(header)
+            for section in sections:
+                file.write(section.tobytes())
+
+    # Function reads postings written by write.
+    @staticmethod
+    def read(file_path):
+        with open(file_path, 'rb') as file:
+            magic, version, little_endian, *lengths = MentionPostings.HEADER.unpack(
+                file.read(MentionPostings.HEADER.size))
+            if magic != MentionPostings.MAGIC or version != MentionPostings.VERSION:
+                raise ValueError("unsupported mention postings file")
+            if bool(little_endian) != (sys.byteorder == "little"):
+                raise ValueError("mention postings file was written with a different byte order")
+            sections = []
+            for typecode, length in zip([MentionPostings.INDEX_TYPECODE, MentionPostings.INDEX_TYPECODE,
+                                         MentionPostings.COUNT_TYPECODE], lengths):
+                section = array(typecode)
+                section.fromfile(file, length)
+                sections.append(section)
+        return MentionPostings(*sections)
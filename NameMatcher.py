@@ -0,0 +1,111 @@
+class NameMatcher:
+    # Counts the mentions of all the persons in a sentence in a single pass over it, instead of one pass per person.
+    # The count of each person is the same as Sentence.check_for_names:
+    #   - every word of the real name counts each time it appears as a word of the sentence,
+    #   - every non-empty nickname counts its non-overlapping appearances in the cleaned sentence string (str.count).
+    # Nicknames are found with an Aho-Corasick automaton over all of them, walked once over the sentence string.
+
+    def __init__(self, persons):
+        # Real name word -> {person index: times the word appears in the person's real name}.
+        self.real_name_words = {}
+        # Nickname -> {person index: times the person has the nickname}.
+        nickname_persons = {}
+        for index, person in enumerate(persons):
+            for word in person.real_name.word_list or []:
+                person_counts = self.real_name_words.setdefault(word, {})
+                person_counts[index] = person_counts.get(index, 0) + 1
+            for nickname in person.nicknames:
+                if nickname.cleaned_data:
+                    person_counts = nickname_persons.setdefault(nickname.cleaned_data, {})
+                    person_counts[index] = person_counts.get(index, 0) + 1
+        self.nicknames = list(nickname_persons)
+        self.nickname_persons = [nickname_persons[nickname] for nickname in self.nicknames]
+        self.build_automaton()
+        # Vocabulary of the last encoded sentence and its size then, and the real name words of real_name_words by their
+        # token ids in it.
+        self.vocabulary = None
+        self.vocabulary_size = 0
+        self.real_name_ids = {}
+
+    # Function keys the real name words by their token ids in the vocabulary, words missing from it can't appear.
+    def encode_real_names(self, vocabulary) -> None:
+        self.vocabulary = vocabulary
+        self.vocabulary_size = len(vocabulary)
+        self.real_name_ids = {vocabulary.get_id(word): person_counts
+                              for word, person_counts in self.real_name_words.items() if word in vocabulary}
+
+    # Function builds the trie of the nicknames with its failure links, and the nicknames ending at each node.
+    def build_automaton(self) -> None:
+        self.transitions = [{}]
+        self.outputs = [[]]
+        for nickname_index, nickname in enumerate(self.nicknames):
+            node = 0
+            for char in nickname:
+                next_node = self.transitions[node].get(char)
+                if next_node is None:
+                    next_node = len(self.transitions)
+                    self.transitions[node][char] = next_node
+                    self.transitions.append({})
+                    self.outputs.append([])
+                node = next_node
+            self.outputs[node].append(nickname_index)
+
+        # The failure link of a node is the node of its longest proper suffix in the trie, set breadth first.
+        self.failures = [0] * len(self.transitions)
+        queue = list(self.transitions[0].values())
+        for node in queue:
+            for char, next_node in self.transitions[node].items():
+                failure = self.failures[node]
+                while failure and char not in self.transitions[failure]:
+                    failure = self.failures[failure]
+                self.failures[next_node] = self.transitions[failure].get(char, 0)
+                # Nicknames ending at the suffix also end here.
+                self.outputs[next_node] = self.outputs[next_node] + self.outputs[self.failures[next_node]]
+                queue.append(next_node)
+
+    # Function returns the number of non-overlapping appearances of each nickname in the text, by nickname index.
+    def count_nicknames(self, text) -> dict:
+        nickname_counts = {}
+        # Earliest position the next counted appearance of each nickname may start at, as str.count skips past
+        # every appearance it counts.
+        next_starts = {}
+        transitions, failures, outputs = self.transitions, self.failures, self.outputs
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in transitions[node]:
+                node = failures[node]
+            node = transitions[node].get(char, 0)
+            for nickname_index in outputs[node]:
+                start = position - len(self.nicknames[nickname_index]) + 1
+                if start >= next_starts.get(nickname_index, 0):
+                    nickname_counts[nickname_index] = nickname_counts.get(nickname_index, 0) + 1
+                    next_starts[nickname_index] = position + 1
+        return nickname_counts
+
+    # Function returns the mentions of the persons in the sentence (a Sentence or a list of words from a preprocessed
+    # file) by person index, only for persons mentioned at least once. The real names are matched by the token ids of
+    # an encoded sentence (e.g. a sentence view of a corpus), whose words are then only rebuilt for the nicknames.
+    def count_mentions(self, sentence) -> dict:
+        if isinstance(sentence, list):
+            words, real_name_words = sentence, self.real_name_words
+        elif sentence.token_ids is not None:
+            # Words may be added to the vocabulary after the real names were looked up in it.
+            if sentence.vocabulary is not self.vocabulary or len(sentence.vocabulary) != self.vocabulary_size:
+                self.encode_real_names(sentence.vocabulary)
+            words, real_name_words = sentence.token_ids.tolist(), self.real_name_ids
+        else:
+            words, real_name_words = sentence.word_list or [], self.real_name_words
+        mentions = {}
+        for word in words:
+            for index, times in real_name_words.get(word, {}).items():
+                mentions[index] = mentions.get(index, 0) + times
+        if not self.nicknames:
+            return mentions
+        if isinstance(sentence, list):
+            cleaned_data = " ".join(sentence)
+        else:
+            cleaned_data = sentence.cleaned_data or ""
+        for nickname_index, count in self.count_nicknames(cleaned_data).items():
+            for index, times in self.nickname_persons[nickname_index].items():
+                mentions[index] = mentions.get(index, 0) + times * count
+        return mentions
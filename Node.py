@@ -1,4 +1,6 @@
 class Node:
+    __slots__ = ('payload', 'neighbors')
+
     def __init__(self, payload):
         self.payload = payload
         self.neighbors = []
@@ -1,14 +1,29 @@
-import Sentence
 from Data import Data
+from TextCleaner import TextCleaner
 
 class Person:
+    # Persons only hold their names, the sequences are generated on access.
+    __slots__ = ('real_name', 'nicknames')
+
     def __init__(self, name, nicknames):
         self.real_name = Data(name)
         self.nicknames = [Data(nickname) for nickname in nicknames.split(',')]
-        self.connections = []
-        self.sequence_list = self.real_name.sequence_list
+
+    # List of the sequences of the real name followed by the sequences of every nickname, generated on access.
+    @property
+    def sequence_list(self):
+        sequence_list = list(self.real_name.sequence_list)
         for nickname in self.nicknames:
-         self.sequence_list += nickname.sequence_list
+            sequence_list += nickname.sequence_list
+        return sequence_list
+
+    # Creates a cleaned person from the words of the real name and of each nickname, e.g. from a preprocessed file.
+    @staticmethod
+    def from_word_lists(real_name, nicknames):
+        person = Person.__new__(Person)
+        person.real_name = Data.from_words(real_name)
+        person.nicknames = [Data.from_words(nickname) for nickname in nicknames]
+        return person
 
     # Function returns the list of cleaned nicknames
     def return_nickname_list(self):
@@ -16,9 +31,10 @@ class Person:
 
     # Function cleans the real name and the nicknames of the person
     def clean(self, unwanted_words):
-        self.real_name.clean(unwanted_words)
+        cleaner = TextCleaner.create(unwanted_words)  # Shared by the real name and all the nicknames.
+        self.real_name.clean(cleaner)
         for nickname in self.nicknames:
-            nickname.clean(unwanted_words)
+            nickname.clean(cleaner)
 
 
 
@@ -5,20 +5,37 @@ from Processor import Processor
 
 
 class PersonCounter:
-    def __init__(self, preprocessed_flag, name_file=None, sentence_file=None, words_to_remove_file_path=None, preprocessed_json_file_path=None):
+    # With streaming set, self.sentences is a generator reading and cleaning the sentences one at a time, so it can only
+    # be counted once.
+    def __init__(self, preprocessed_flag, name_file=None, sentence_file=None, words_to_remove_file_path=None, preprocessed_json_file_path=None,
+                 streaming=False):
+        # Input files the sentences and persons come from, the key of their mention postings in the cache.
+        if preprocessed_flag:
+            self.input_file_paths = (preprocessed_json_file_path, None, None)
+        else:
+            self.input_file_paths = (sentence_file, name_file, words_to_remove_file_path)
         if preprocessed_flag:
             # Unpacks the sentences and people from the json that is in the same format as task 1
-            preprocessed_json = json_manager.load_json_file(preprocessed_json_file_path)
+            preprocessed_json = json_manager.load_preprocessed_file(preprocessed_json_file_path)
             self.sentences = preprocessed_json["Question 1"]["Processed Sentences"]
             self.names = preprocessed_json["Question 1"]["Processed Names"]
+            if "Persons" in preprocessed_json["Question 1"]:  # Binary corpus files also provide the cleaned persons.
+                self.persons = preprocessed_json["Question 1"]["Persons"]
+        elif Processor.cache is not None:
+            # Reuses the sentences and persons cleaned by a previous run on the same files.
+            self.sentences, self.persons = Processor.load_from_cache(sentence_file, name_file, words_to_remove_file_path)
+        elif streaming:
+            words_to_remove = Processor.read_text_cleaner(words_to_remove_file_path)
+            self.sentences = Processor.iterate_sentences(sentence_file, words_to_remove)
+            self.persons = Processor.clean_names(Processor.read_csv_file(name_file), words_to_remove)
         else:
             # Executes the preprocessing cleaning procedure and sets the variables needed (sentences and persons)
             self.sentences = Processor.read_csv_file(sentence_file)
             self.persons = Processor.read_csv_file(name_file)
-            words_to_remove = Processor.read_csv_file(words_to_remove_file_path)
-            Processor.clean_sentences(self.sentences, words_to_remove)
-            for person in self.persons:
-                person.clean(words_to_remove)  # Cleans each person's name by removing unwanted words.
+            words_to_remove = Processor.read_text_cleaner(words_to_remove_file_path)
+            self.sentences = Processor.clean_sentences(self.sentences, words_to_remove)
+            # Cleans each person's name by removing unwanted words and drops duplicate names.
+            self.persons = Processor.clean_names(self.persons, words_to_remove)
 
     @staticmethod
     # Turns seq_dict to key-value tuples
@@ -29,13 +46,14 @@ class PersonCounter:
 
         return list_of_lists
 
-    # Iterates over the sentences and counts the appearance of each person and returns dictionary name to number
+    # Counts the appearance of each person from the mention postings and returns dictionary name to number.
+    # The postings are built in a single pass over the sentences (so they may be streamed), scanning each sentence once
+    # for all the persons' names, or reused from the preprocessing cache.
     def count_person_appearances(self):
         person_mention_dict = {}
-        for person in self.persons:
-            mention_counter = 0
-            for sentence in self.sentences:
-                mention_counter += sentence.check_for_names(person)  # Counts occurrences of the person's name in sentences.
+        mention_postings = Processor.get_mention_postings(self.sentences, self.persons, self.input_file_paths)
+        mention_counters = [mention_postings.total_mentions(i) for i in range(len(self.persons))]
+        for person, mention_counter in zip(self.persons, mention_counters):
             if mention_counter > 0:  # Only store persons who appear at least once.
                 person_mention_dict[person.real_name.cleaned_data] = mention_counter
 
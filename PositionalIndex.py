@@ -0,0 +1,89 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+from Corpus import Corpus
+
+
+class PositionalIndex:
+    # Positional inverted index of a corpus: for every token id, the sorted positions of its appearances in the corpus
+    # token buffer. The positions of token t are positions[token_offsets[t]:token_offsets[t + 1]] (CSR layout).
+    # A sequence of words appears where its tokens are at consecutive positions within one sentence, so a query only
+    # looks at the positions of its own tokens and never at the rest of the corpus.
+    POSITION_TYPECODE = 'q'
+
+    def __init__(self, corpus, token_offsets=None, positions=None):
+        self.corpus = corpus
+        if positions is None:
+            token_offsets, positions = PositionalIndex.build(corpus)
+        self.token_offsets = token_offsets
+        self.positions = positions
+        # The saved index file the arrays are mapped from (see SearchIndexFile), if any.
+        self.index_file = None
+
+    # Builds the index of the corpus of the sentences (or word lists from a preprocessed file). A corpus, e.g. from a
+    # binary corpus file, is used as it is.
+    @staticmethod
+    def from_sentences(sentences):
+        if isinstance(sentences, Corpus):
+            return PositionalIndex(sentences)
+        return PositionalIndex(Corpus.from_word_lists(sentence if isinstance(sentence, list) else sentence.word_list
+                                                      for sentence in sentences))
+
+    # Function returns the token offsets and positions of the corpus, grouping the positions by token with a counting
+    # sort in two passes over the tokens.
+    @staticmethod
+    def build(corpus):
+        start, end = corpus.offsets[0], corpus.offsets[-1]
+        tokens = corpus.tokens
+        token_offsets = array(PositionalIndex.POSITION_TYPECODE, [0] * (len(corpus.vocabulary) + 1))
+        for position in range(start, end):
+            token_offsets[tokens[position] + 1] += 1
+        for token_id in range(len(corpus.vocabulary)):
+            token_offsets[token_id + 1] += token_offsets[token_id]
+        next_slots = list(token_offsets[:-1])
+        positions = array(PositionalIndex.POSITION_TYPECODE, [0] * (end - start))
+        for position in range(start, end):
+            token_id = tokens[position]
+            positions[next_slots[token_id]] = position
+            next_slots[token_id] += 1
+        return token_offsets, positions
+
+    # Function unmaps the saved index file the index was read from, the index can't be used afterwards. An index built
+    # in memory is left as it is.
+    def close(self) -> None:
+        if self.index_file is not None:
+            self.index_file.close()
+
+    # Function returns the sorted positions of the token in the corpus token buffer.
+    def get_positions(self, token_id):
+        return self.positions[self.token_offsets[token_id]:self.token_offsets[token_id + 1]]
+
+    # Function returns the index of the sentence the position in the corpus token buffer belongs to.
+    def get_sentence_index(self, position) -> int:
+        return bisect_right(self.corpus.offsets, position) - 1
+
+    # Function returns the start positions of every appearance of the words as consecutive words of a sentence. The
+    # positions of the rarest word are checked against the positions of the others by binary search.
+    def find_positions(self, words) -> list:
+        token_ids = [self.corpus.vocabulary.get_id(word) for word in words]
+        if not token_ids or -1 in token_ids:
+            return []
+        postings = [self.get_positions(token_id) for token_id in token_ids]
+        rarest = min(range(len(postings)), key=lambda i: len(postings[i]))
+        start_positions = []
+        for position in postings[rarest]:
+            start = position - rarest
+            if all(PositionalIndex.contains(postings[i], start + i) for i in range(len(postings)) if i != rarest) and \
+                    self.get_sentence_index(start) == self.get_sentence_index(start + len(postings) - 1):
+                start_positions.append(start)
+        return start_positions
+
+    # Function checks if the sorted positions contain the position.
+    @staticmethod
+    def contains(positions, position) -> bool:
+        i = bisect_left(positions, position)
+        return i < len(positions) and positions[i] == position
+
+    # Function returns the sorted indices of the sentences containing the words as consecutive words.
+    def sentences_containing(self, words) -> list:
+        return sorted({self.get_sentence_index(position) for position in self.find_positions(words)})
@@ -0,0 +1,107 @@
+import hashlib
+import os
+import tempfile
+
+from Corpus import Corpus
+from CorpusFile import CorpusFile
+from MentionPostings import MentionPostings
+from TextCleaner import TextCleaner
+
+
+class PreprocessingCache:
+    # Default total size of the cache directory, the least recently used entries are evicted above it.
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+    # Size of the blocks the input files are hashed in.
+    HASH_BLOCK_SIZE = 1024 * 1024
+    SUFFIX = ".corpus"
+    # Mention postings of the persons in the sentences, keyed by the inputs and the persons (see
+    # MentionPostings.create_cache_key).
+    POSTINGS_SUFFIX = ".mentions"
+
+    # Cleaned corpora are stored as binary corpus files named by the hash of the inputs that produced them.
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # Function returns the sha256 of the file contents, or of nothing when there is no file.
+    @staticmethod
+    def hash_file(file_path) -> str:
+        file_hash = hashlib.sha256()
+        if file_path is not None:
+            with open(file_path, 'rb') as file:
+                for block in iter(lambda: file.read(PreprocessingCache.HASH_BLOCK_SIZE), b""):
+                    file_hash.update(block)
+        return file_hash.hexdigest()
+
+    # Function returns the cache key of the inputs. It changes with the contents of any of the files and with the
+    # cleaning rules and file format versions, never with the file paths.
+    @staticmethod
+    def create_key(sentence_file_path, people_file_path, remove_words_path) -> str:
+        key = hashlib.sha256()
+        for file_path in (sentence_file_path, people_file_path, remove_words_path):
+            key.update(PreprocessingCache.hash_file(file_path).encode("ascii"))
+        key.update(("cleaner=%d,corpus=%d" % (TextCleaner.VERSION, CorpusFile.VERSION)).encode("ascii"))
+        return key.hexdigest()
+
+    def get_path(self, key, suffix=SUFFIX) -> str:
+        return os.path.join(self.cache_dir, key + suffix)
+
+    # Function returns the processed sentences and names stored under the key, or None if they are not cached.
+    # Reading an entry marks it as recently used.
+    def load(self, key):
+        path = self.get_path(key)
+        if not os.path.isfile(path):
+            return None
+        os.utime(path)
+        # The entry is unmapped right away, so it can be evicted or replaced later on.
+        with CorpusFile(path) as corpus_file:
+            return corpus_file.corpus.word_lists(), corpus_file.processed_names
+
+    # Function stores the processed sentences and names under the key and evicts old entries if needed. The entry is
+    # written to a temporary file first, so a concurrent run never reads a partial entry.
+    def store(self, key, processed_sentences, processed_names) -> None:
+        self.write_entry(self.get_path(key), lambda temp_path: CorpusFile.write(
+            temp_path, Corpus.from_word_lists(processed_sentences), processed_names))
+
+    # Function returns the mention postings stored under the key, or None if they are not cached.
+    def load_postings(self, key):
+        path = self.get_path(key, PreprocessingCache.POSTINGS_SUFFIX)
+        if not os.path.isfile(path):
+            return None
+        os.utime(path)
+        try:
+            return MentionPostings.read(path)
+        except ValueError:  # Written by another version, built again.
+            return None
+
+    # Function stores the mention postings under the key and evicts old entries if needed.
+    def store_postings(self, key, mention_postings) -> None:
+        self.write_entry(self.get_path(key, PreprocessingCache.POSTINGS_SUFFIX), mention_postings.write)
+
+    # Function writes an entry with the write function to a temporary file first and then moves it to the path, so a
+    # concurrent run never reads a partial entry. Old entries are evicted afterwards if needed.
+    def write_entry(self, path, write) -> None:
+        descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(descriptor)
+        try:
+            write(temp_path)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self.evict()
+
+    # Function removes the least recently used entries until the cache is within max_bytes.
+    def evict(self) -> None:
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith((PreprocessingCache.SUFFIX, PreprocessingCache.POSTINGS_SUFFIX)):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total_size -= size
@@ -1,17 +1,38 @@
 import csv
+import itertools
 import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
+import json_manager
+from Corpus import Corpus
+from CorpusFile import CorpusFile
+from MentionPostings import MentionPostings
 from Person import Person
-from Sentence import Sentence
+from Sentence import CompactSentence, Sentence
+from TextCleaner import TextCleaner
+from Vocabulary import Vocabulary
 
 
 class Processor:
+    # Number of worker processes used for cleaning, None or 1 cleans in the current process.
+    workers = None
+    # PreprocessingCache the cleaned sentences and names are reused from, None preprocesses the files every time.
+    cache = None
+    # Number of texts sent to a worker process at once.
+    CHUNK_SIZE = 1000
+
     @staticmethod
-    def read_csv_file(file_path, unwanted_words=None):
+    def read_csv_file(file_path, unwanted_words=None, compact=False):
         # Reads the CSV file and processes it based on its type (sentence, name, or common words).
+        return list(Processor.iterate_csv_file(file_path, unwanted_words, compact))
+
+    @staticmethod
+    def iterate_csv_rows(file_path):
+        # Generator yielding the type of the file (sentence, name, or common words), determined by the header, with each
+        # of the following rows.
         with open(file_path, 'r', newline="", encoding="utf-8") as file:
             reader = csv.reader(file)
-            lines = []
             line_type = ""
             for row in reader:
                 if reader.line_num == 1:  # Determines the type of data in the file based on the header.
@@ -22,64 +43,289 @@ class Processor:
                     else:
                         line_type = "common"
                 else:
-                    if line_type == "sentence":
-                        lines.append(Sentence(row[0], unwanted_words))  # Creates a Sentence object.
-                    elif line_type == "name":
-                        lines.append(Person(row[0], row[1]))  # Creates a Person object with a main name and other names.
-                    else:
-                        lines.append(row[0])  # Adds common words directly as strings.
-        return lines
+                    yield line_type, row
+
+    @staticmethod
+    def iterate_csv_file(file_path, unwanted_words=None, compact=False, workers=None):
+        # Generator yielding the processed lines of the CSV file one at a time, so callers can process files of any
+        # size without keeping them in memory. The type of the lines is determined by the header like read_csv_file.
+        # With compact set, sentences are slotted and drop their original string after cleaning.
+        sentence_class = CompactSentence if compact else Sentence
+        unwanted_words = TextCleaner.create(unwanted_words)  # Built once and shared by every sentence.
+        if workers is None:
+            workers = Processor.workers
+        rows = Processor.iterate_csv_rows(file_path)
+        for line_type, row in rows:
+            if line_type == "sentence" and workers and workers > 1:
+                # Sentences are cleaned by the worker processes, in chunks and in order.
+                texts = itertools.chain([row[0]], (row[0] for line_type, row in rows))
+                for word_list in Processor.parallel_tokenize(texts, unwanted_words, workers):
+                    yield sentence_class.from_words(word_list)
+            elif line_type == "sentence":
+                yield sentence_class(row[0], unwanted_words)  # Creates a Sentence object.
+            elif line_type == "name":
+                yield Person(row[0], row[1])  # Creates a Person object with a main name and other names.
+            else:
+                yield row[0]  # Yields common words directly as strings.
+
+    @staticmethod
+    def iterate_sentences(sentence_file_path, common_words_list, workers=None):
+        # Generator yielding the cleaned, non empty sentences of the file one at a time.
+        for sentence in Processor.iterate_csv_file(sentence_file_path, common_words_list, compact=True, workers=workers):
+            if not sentence.sentence_empty():
+                yield sentence
+
+    @staticmethod
+    # Cleans a chunk of texts, runs in the worker processes.
+    def tokenize_texts(texts, cleaner):
+        return [cleaner.tokenize(text) for text in texts]
+
+    @staticmethod
+    # Generator cleaning the texts in a pool of worker processes and yielding their word lists in the original order.
+    # Texts are submitted in chunks, and only a few chunks per worker are in flight so the texts can be streamed.
+    def parallel_tokenize(texts, cleaner, workers, chunk_size=None):
+        if chunk_size is None:
+            chunk_size = Processor.CHUNK_SIZE
+        texts = iter(texts)
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            while True:
+                chunk = list(itertools.islice(texts, chunk_size))
+                if chunk:
+                    pending.append(executor.submit(Processor.tokenize_texts, chunk, cleaner))
+                if pending and (not chunk or len(pending) >= 2 * workers):
+                    yield from pending.popleft().result()
+                elif not chunk:
+                    return
 
+    # Reads the remove words file and returns a cleaner built from it that can be shared by all the cleaning calls.
     @staticmethod
-    def clean(data_list, common_words_list):
+    def read_text_cleaner(file_path):
+        return TextCleaner(Processor.read_csv_file(file_path))
+
+    @staticmethod
+    def clean(data_list, common_words_list, workers=None):
         # Cleans each item in the provided data list using the list of common words.
+        cleaner = TextCleaner.create(common_words_list)  # Built once instead of once per item.
+        if workers is None:
+            workers = Processor.workers
+        if workers and workers > 1:
+            # Cleans the texts of all the items (names and nicknames for persons) in the worker processes.
+            items = [item for data in data_list for item in Processor.get_data_items(data)]
+            texts = [item.data if item.data is not None else item.cleaned_data for item in items]
+            for item, word_list in zip(items, Processor.parallel_tokenize(texts, cleaner, workers)):
+                item.set_words(word_list)
+            return
+        for data in data_list:
+            data.clean(cleaner)
+
+    @staticmethod
+    # Returns the Data objects that make up an item: the item itself, or the real name and nicknames of a person.
+    def get_data_items(data):
+        if isinstance(data, Person):
+            return [data.real_name] + data.nicknames
+        return [data]
+
+    @staticmethod
+    # Interns the words of every item in a shared vocabulary and keeps only their token ids, the words are rebuilt
+    # when they are needed for output.
+    def encode(data_list, vocabulary=None):
+        if vocabulary is None:
+            vocabulary = Vocabulary()
+        for data in data_list:
+            data.encode(vocabulary)
+        return vocabulary
+
+    @staticmethod
+    # Packs the cleaned sentences in a Corpus, a single token id buffer plus sentence offsets with sentence views on top.
+    def build_corpus(sentences_list, vocabulary=None):
+        return Corpus.from_sentences(sentences_list, vocabulary)
+
+    @staticmethod
+    # Bounds the length of the sequences each item generates, so callers that only need short sequences don't pay for
+    # every length of long sentences.
+    def set_max_sequence_length(data_list, max_sequence_length):
         for data in data_list:
-            data.clean(common_words_list)
+            data.set_max_sequence_length(max_sequence_length)
+
+    @staticmethod
+    # Sets the mentions of every sentence to the set of persons it mentions, taken from the mention postings of the
+    # persons (built in a single pass over the sentences if not given). Returns the sentences as a list, so the
+    # mentions stay with them when the sentences are views of a corpus.
+    def set_mentions(sentences, persons, mention_postings=None):
+        sentences = list(sentences)
+        if mention_postings is None:
+            mention_postings = MentionPostings.build(sentences, persons)
+        mentions = [set() for _ in sentences]
+        for person_index, person in enumerate(persons):
+            for sentence_index in mention_postings.get_sentence_indices(person_index):
+                mentions[sentence_index].add(person)
+        for sentence, sentence_mentions in zip(sentences, mentions):
+            sentence.mentions = frozenset(sentence_mentions)
+        return sentences
+
+    @staticmethod
+    # Returns the mention postings of the persons in the sentences. With the preprocessing cache set, they are stored
+    # under a key of the input files the sentences and persons come from (the sentence, people and remove words
+    # files, or the preprocessed file followed by None) and of the persons, so they are only built once for the same
+    # inputs.
+    def get_mention_postings(sentences, persons, input_file_paths=None):
+        if Processor.cache is None or input_file_paths is None:
+            return MentionPostings.build(sentences, persons)
+        key = MentionPostings.create_cache_key(Processor.cache.create_key(*input_file_paths), persons)
+        mention_postings = Processor.cache.load_postings(key)
+        if mention_postings is None:
+            mention_postings = MentionPostings.build(sentences, persons)
+            Processor.cache.store_postings(key, mention_postings)
+        return mention_postings
 
     @staticmethod
     # If two people have the same full name, keep the one that appeared first in the file.
+    # Returns a new list, the cleaned names already kept are looked up in a set.
     def remove_duplicate_names(person_list):
-        unique_cleaned_names = []
+        unique_cleaned_names = set()
         unique_names = []
         for person in person_list:
             if person.real_name.cleaned_data not in unique_cleaned_names:
                 unique_names.append(person)  # Keeps the first occurrence of each unique name.
-                unique_cleaned_names.append(person.real_name.cleaned_data)
+                unique_cleaned_names.add(person.real_name.cleaned_data)
         return unique_names
 
     @staticmethod
-    # Remove sentences with 0 words.
+    # Remove sentences with 0 words. Returns a new list of the non empty sentences.
     def remove_empty_sentences(sentences_list):
-        for sentence in sentences_list:
-            if sentence.sentence_empty():
-                sentences_list.remove(sentence)  # Removes sentences that became empty after cleaning.
+        return [sentence for sentence in sentences_list if not sentence.sentence_empty()]
+
+    # Function takes a list of sentences and a list of common words, cleans each sentence and returns the list of the
+    # sentences that are not empty.
+    @staticmethod
+    def clean_sentences(sentences_list, common_words_list, workers=None):
+        Processor.clean(sentences_list, common_words_list, workers)
+        return Processor.remove_empty_sentences(sentences_list)
+
+    # Function takes a list of persons and a list of common words, cleans each person and returns the list of the
+    # persons without duplicate names.
+    @staticmethod
+    def clean_names(person_list, common_words_list, workers=None):
+        Processor.clean(person_list, common_words_list, workers)
+        return Processor.remove_duplicate_names(person_list)
+
+    # Function cleans the sentences and names files and returns the words of each non empty sentence and the names
+    # in the processed format, a list of [real name words, [nickname words, ...]] without duplicate names.
+    # When a preprocessing cache is set, the result is read from it if the same files were preprocessed before.
+    # Otherwise, with streaming set, the words of the sentences are a generator cleaning them as they are consumed (see
+    # iterate_preprocessed_files).
+    @staticmethod
+    def preprocess(sentence_file_path, people_file_path, remove_words_path, workers=None, streaming=False):
+        if Processor.cache is not None:
+            key = Processor.cache.create_key(sentence_file_path, people_file_path, remove_words_path)
+            cached = Processor.cache.load(key)
+            if cached is None:
+                cached = Processor.preprocess_files(sentence_file_path, people_file_path, remove_words_path, workers)
+                Processor.cache.store(key, *cached)
+            return cached
+        if streaming:
+            return Processor.iterate_preprocessed_files(sentence_file_path, people_file_path, remove_words_path,
+                                                        workers)
+        return Processor.preprocess_files(sentence_file_path, people_file_path, remove_words_path, workers)
+
+    # Function does the preprocessing of preprocess without any cache. people_file_path may be None for tasks that
+    # don't use names.
+    @staticmethod
+    def preprocess_files(sentence_file_path, people_file_path, remove_words_path, workers=None):
+        processed_sentences, processed_names = Processor.iterate_preprocessed_files(
+            sentence_file_path, people_file_path, remove_words_path, workers)
+        return list(processed_sentences), processed_names
 
-    # Function takes a list of sentences and a list of common words, cleans each sentence and then removes the empty
-    # sentences from the list.
+    # Function does the preprocessing of preprocess_files, but returns the words of the sentences as a generator that
+    # reads and cleans the sentences one at a time while it is consumed (e.g. written out by JsonWriter), so they are
+    # never all held in memory. The names are cleaned before returning.
     @staticmethod
-    def clean_sentences(sentences_list, common_words_list):
-        Processor.clean(sentences_list, common_words_list)
-        Processor.remove_empty_sentences(sentences_list)
+    def iterate_preprocessed_files(sentence_file_path, people_file_path, remove_words_path, workers=None):
+        name_list = Processor.read_csv_file(people_file_path) if people_file_path is not None else []
+        common_words = Processor.read_text_cleaner(remove_words_path)
+
+        # Sentences are streamed, cleaned and empty ones skipped as they are read, only their words are kept.
+        processed_sentences = (sentence.word_list for sentence in
+                               Processor.iterate_sentences(sentence_file_path, common_words, workers))
+        # Cleans names by removing common words and ensures names are unique after cleaning.
+        name_list = Processor.clean_names(name_list, common_words, workers)
+
+        processed_names = [
+            [name.real_name.word_list,  # Stores the main name.
+             [nickname.word_list for nickname in name.nicknames if len(nickname.word_list) > 0]]  # Stores valid nicknames.
+            for name in name_list
+        ]
+        return processed_sentences, processed_names
+
+    # Function returns the cleaned, non empty sentences and the persons without duplicate names from the preprocessing
+    # cache, filling it on a miss. Used by the tasks when Processor.cache is set.
+    @staticmethod
+    def load_from_cache(sentence_file_path, people_file_path, remove_words_path):
+        processed_sentences, processed_names = Processor.preprocess(sentence_file_path, people_file_path,
+                                                                    remove_words_path)
+        sentences = [CompactSentence.from_words(word_list) for word_list in processed_sentences]
+        persons = [Person.from_word_lists(real_name, nicknames) for real_name, nicknames in processed_names]
+        return sentences, persons
+
+    # Function adds new sentences and names to an existing preprocessed file (Task 1 JSON or binary corpus file) and
+    # returns all the processed sentences and names. Only the new files are cleaned, and new names already in the
+    # preprocessed file are dropped like any other duplicate name. people_file_path may be None to only add sentences.
+    @staticmethod
+    def append_preprocessed(preprocessed_file_path, sentence_file_path, people_file_path, remove_words_path,
+                            workers=None):
+        preprocessed = json_manager.load_preprocessed_file(preprocessed_file_path)["Question 1"]
+        new_sentences, new_names = Processor.preprocess_files(sentence_file_path, people_file_path, remove_words_path,
+                                                              workers)
+        processed_sentences = preprocessed["Processed Sentences"]
+        if isinstance(processed_sentences, Corpus):
+            # The words are copied out of a binary preprocessed file, which is then unmapped so it can be rewritten.
+            corpus = processed_sentences
+            try:
+                processed_sentences = corpus.word_lists()
+            finally:
+                corpus.close()
+        return processed_sentences + new_sentences, Processor.merge_processed_names(preprocessed["Processed Names"],
+                                                                                    new_names)
+
+    # Function appends the new processed names to the existing ones, skipping names whose cleaned real name already
+    # appears, so the first occurrence is kept as in remove_duplicate_names.
+    @staticmethod
+    def merge_processed_names(processed_names, new_names):
+        cleaned_names = {" ".join(real_name) for real_name, _ in processed_names}
+        merged_names = list(processed_names)
+        for real_name, nicknames in new_names:
+            if " ".join(real_name) not in cleaned_names:
+                merged_names.append([real_name, nicknames])
+                cleaned_names.add(" ".join(real_name))
+        return merged_names
 
     # Function returns the preprocessed names and sentences in the JSON format as needed.
     @staticmethod
-    def output_to_json(sentence_file_path, people_file_path, remove_words_path):
-        sentences_list = Processor.read_csv_file(sentence_file_path)
-        name_list = Processor.read_csv_file(people_file_path)
-        common_words = Processor.read_csv_file(remove_words_path)
+    def output_to_json(sentence_file_path, people_file_path, remove_words_path, workers=None):
+        processed_sentences, processed_names = Processor.preprocess(sentence_file_path, people_file_path,
+                                                                    remove_words_path, workers)
+        return Processor.format_json(processed_sentences, processed_names)
 
-        Processor.clean(sentences_list, common_words)  # Cleans sentences by removing common words.
-        Processor.clean(name_list, common_words)  # Cleans names by removing common words.
-        Processor.remove_empty_sentences(sentences_list)  # Removes any sentences that are empty after cleaning.
-        Processor.remove_duplicate_names(name_list)  # Ensures names are unique after cleaning.
+    # Function returns the processed sentences and names in the Task 1 JSON format.
+    @staticmethod
+    def format_json(processed_sentences, processed_names):
+        return json.dumps(Processor.create_document(processed_sentences, processed_names))
 
-        return json.dumps({
+    # Function returns the Task 1 document of the processed sentences and names, which may be written with JsonWriter
+    # instead of serialized at once.
+    @staticmethod
+    def create_document(processed_sentences, processed_names) -> dict:
+        return {
             "Question 1": {
-                "Processed Sentences": [sentence.word_list for sentence in sentences_list],
-                "Processed Names": [
-                    [name.real_name.word_list,  # Stores the main name.
-                     [nickname.word_list for nickname in name.nicknames if len(nickname.word_list) > 0]]  # Stores valid nicknames.
-                    for name in name_list
-                ]
+                "Processed Sentences": processed_sentences,
+                "Processed Names": processed_names
             }
-        })
+        }
+
+    # Function writes the processed sentences and names to a binary corpus file, which the other tasks can load
+    # (memory-mapped) with --preprocessed instead of the JSON.
+    @staticmethod
+    def output_to_binary(binary_file_path, processed_sentences, processed_names):
+        corpus = Corpus.from_word_lists(processed_sentences)
+        CorpusFile.write(binary_file_path, corpus, processed_names)
@@ -0,0 +1,75 @@
+import asyncio
+import json
+import sys
+
+
+class QueryServer:
+    # Answers Task 4 and Task 7 queries from a corpus and indices loaded once, instead of one process per query file.
+    # Clients connect over TCP and send one JSON request per line:
+    #   {"task": 4, "keys": [[word, ...], ...]}
+    #   {"task": 7, "keys": [[name, name], ...], "maximal_distance": 2}   (maximal_distance is optional)
+    # and get back one line per request with the JSON document the task writes for a query file, or
+    # {"error": "invalid input"} if the request can't be answered. "task" may be left out when only one task is served.
+    # Clients are served concurrently by an asyncio event loop. A request is answered without yielding to the loop,
+    # so requests never see the engines in the middle of another request.
+    DEFAULT_HOST = "127.0.0.1"
+    # Longest request line accepted, in bytes.
+    MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, search_engine=None, connection_finder=None):
+        # Task number -> function answering a request of that task with a JSON string.
+        self.handlers = {}
+        if search_engine is not None:
+            self.handlers[4] = lambda request: search_engine.build_dict(request["keys"])
+        if connection_finder is not None:
+            self.handlers[7] = lambda request: connection_finder.find_indirect_connections(
+                request["keys"], request.get("maximal_distance"))
+
+    # Function returns the response line to a request line.
+    def handle_request(self, line) -> str:
+        try:
+            request = json.loads(line)
+            task = request.get("task")
+            if task is None and len(self.handlers) == 1:
+                task = next(iter(self.handlers))
+            return self.handlers[task](request)
+        except Exception:
+            return json.dumps({"error": "invalid input"})
+
+    # Function answers the requests of a client until it disconnects.
+    async def handle_client(self, reader, writer) -> None:
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # The request is longer than MAX_REQUEST_BYTES.
+                    writer.write((json.dumps({"error": "invalid input"}) + "\n").encode("utf-8"))
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                writer.write((self.handle_request(line) + "\n").encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # Function starts listening on the host and port (any free port if 0) and returns the asyncio server.
+    async def start(self, host=DEFAULT_HOST, port=0):
+        return await asyncio.start_server(self.handle_client, host, port, limit=QueryServer.MAX_REQUEST_BYTES)
+
+    # Function serves clients until the process is stopped.
+    def serve_forever(self, host=DEFAULT_HOST, port=0) -> None:
+        async def serve():
+            server = await self.start(host, port)
+            address = server.sockets[0].getsockname()
+            print("serving on %s:%d" % (address[0], address[1]), file=sys.stderr, flush=True)
+            async with server:
+                await server.serve_forever()
+
+        try:
+            asyncio.run(serve())
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,49 @@
+class QueryTrie:
+    # Token trie of a batch of sequence queries, matched against all the sentences of a corpus in one scan of its
+    # tokens. Queries sharing a prefix share the trie nodes of that prefix, so the work of a scan grows with the corpus
+    # times the length of the longest query, not with the number of queries.
+    # A query with a word missing from the vocabulary can't appear in the corpus and is left out of the trie.
+
+    def __init__(self, vocabulary, queries):
+        self.query_count = len(queries)
+        # Node 0 is the root, a node's transitions map token ids to child nodes.
+        self.transitions = [{}]
+        # Indices of the queries ending at each node (more than one for duplicate queries).
+        self.query_indices = [[]]
+        for query_index, words in enumerate(queries):
+            token_ids = [vocabulary.get_id(word) for word in words]
+            if not token_ids or -1 in token_ids:
+                continue
+            node = 0
+            for token_id in token_ids:
+                next_node = self.transitions[node].get(token_id)
+                if next_node is None:
+                    next_node = len(self.transitions)
+                    self.transitions[node][token_id] = next_node
+                    self.transitions.append({})
+                    self.query_indices.append([])
+                node = next_node
+            self.query_indices[node].append(query_index)
+
+    # Function returns for each query the sorted indices of the corpus sentences containing its words as consecutive
+    # words. Every sentence is scanned once, walking the trie from each of its positions as long as the tokens follow
+    # a query prefix.
+    def match(self, corpus) -> list:
+        matches = [[] for _ in range(self.query_count)]
+        transitions, query_indices = self.transitions, self.query_indices
+        root = transitions[0]
+        for sentence_index in range(len(corpus)):
+            tokens = corpus.token_ids(sentence_index).tolist()
+            for start, token_id in enumerate(tokens):
+                node = root.get(token_id)
+                position = start + 1
+                while node is not None:
+                    for query_index in query_indices[node]:
+                        query_matches = matches[query_index]
+                        if not query_matches or query_matches[-1] != sentence_index:
+                            query_matches.append(sentence_index)
+                    if position == len(tokens):
+                        break
+                    node = transitions[node].get(tokens[position])
+                    position += 1
+        return matches
@@ -1,43 +1,116 @@
+from array import array
+
 import json_manager
 from json_manager import *
+from LruCache import LruCache
+from PositionalIndex import PositionalIndex
+from PreprocessingCache import PreprocessingCache
 from Processor import Processor
+from QueryTrie import QueryTrie
+from SearchIndexFile import SearchIndexFile
+from SuffixArray import SuffixArray
 
 
 class SearchEngine:
+    # Number of distinct sequences from which a query file is answered by one scan of the sentences instead of one
+    # index lookup per sequence.
+    BATCH_MIN_QUERIES = 100
+    # Indices of the sentences found for each sequence, shared by all the engines (see create_result_cache). Off by
+    # default, a one-off run rarely searches for the same sequence twice.
+    result_cache = None
+    # Default total number of sentence indices kept by the result cache.
+    RESULT_CACHE_INDICES = 1000000
+
     def __init__(self, seq_json_path, preprocessed_flag, sentence_file=None, words_to_remove_file_path=None,
-                 preprocessed_json_file_path=None):
-        # Loads the sequences to be searched for from the JSON file.
-        self.sequences_lists = load_json_file(seq_json_path)["keys"]
-        self.sequence_list = []
+                 preprocessed_json_file_path=None, suffix_array=False, search_index_path=None):
+        # Loads the sequences to be searched for from the JSON file, if any (a server gets them with each request).
+        self.sequences_lists = load_json_file(seq_json_path)["keys"] if seq_json_path is not None else []
+        self.sequence_list = SearchEngine.create_sequence_list(self.sequences_lists)
 
-        # Converts the list of sequences into space-separated strings.
-        for sequence_list in self.sequences_lists:
-            sequence = ""
-            for i in range(len(sequence_list)):
-                sequence += sequence_list[i]
-                if i != len(sequence_list) - 1:
-                    sequence += " "  # Adds spaces between words except for the last one.
-            self.sequence_list.append(sequence)
+        if search_index_path is not None and not suffix_array:
+            # A saved index of the same inputs is mapped instead of cleaning the sentences and building it again.
+            self.index = SearchEngine.load_index(search_index_path, preprocessed_flag, sentence_file,
+                                                 words_to_remove_file_path, preprocessed_json_file_path)
+            self.sentences = self.index.corpus
+            return
+
+        self.sentences = SearchEngine.load_sentences(preprocessed_flag, sentence_file, words_to_remove_file_path,
+                                                     preprocessed_json_file_path)
+        if not preprocessed_flag:
+            # Sentences only need to generate sequences as long as the longest query.
+            longest_query = max((len(sequence_list) for sequence_list in self.sequences_lists), default=0)
+            Processor.set_max_sequence_length(self.sentences, longest_query)
+
+        # Sequences are found with an index of the sentences instead of checking every sentence: a positional inverted
+        # index by default, or a suffix array searched by binary search.
+        self.index = SuffixArray.from_sentences(self.sentences) if suffix_array else \
+            PositionalIndex.from_sentences(self.sentences)
 
+    # Function returns the sentences to search in, from the preprocessed file or cleaned from the sentence file.
+    @staticmethod
+    def load_sentences(preprocessed_flag, sentence_file=None, words_to_remove_file_path=None,
+                       preprocessed_json_file_path=None):
         if preprocessed_flag:
             # Loads preprocessed sentences if available.
-            preprocessed_json = json_manager.load_json_file(preprocessed_json_file_path)
-            self.sentences = preprocessed_json["Question 1"]["Processed Sentences"]
+            preprocessed_json = json_manager.load_preprocessed_file(preprocessed_json_file_path)
+            return preprocessed_json["Question 1"]["Processed Sentences"]
+        if Processor.cache is not None:
+            # Reuses the sentences cleaned by a previous run on the same files.
+            sentences, _ = Processor.load_from_cache(sentence_file, None, words_to_remove_file_path)
+            return sentences
+        # Reads raw sentences and cleans them using the words to remove.
+        sentences = Processor.read_csv_file(sentence_file)
+        words_to_remove = Processor.read_text_cleaner(words_to_remove_file_path)
+        return Processor.clean_sentences(sentences, words_to_remove)
+
+    # Function returns the positional index saved at the path if it was built from the same inputs, otherwise builds
+    # it and saves it there for the next runs.
+    @staticmethod
+    def load_index(search_index_path, preprocessed_flag, sentence_file=None, words_to_remove_file_path=None,
+                   preprocessed_json_file_path=None):
+        if preprocessed_flag:
+            corpus_hash = PreprocessingCache.create_key(preprocessed_json_file_path, None, None)
         else:
-            # Reads raw sentences and cleans them using the words to remove.
-            self.sentences = Processor.read_csv_file(sentence_file)
-            words_to_remove = Processor.read_csv_file(words_to_remove_file_path)
-            Processor.clean_sentences(self.sentences, words_to_remove)
+            corpus_hash = PreprocessingCache.create_key(sentence_file, None, words_to_remove_file_path)
+        index = SearchIndexFile.read(search_index_path, corpus_hash)
+        if index is None:
+            index = PositionalIndex.from_sentences(SearchEngine.load_sentences(
+                preprocessed_flag, sentence_file, words_to_remove_file_path, preprocessed_json_file_path))
+            SearchIndexFile.write(search_index_path, index, corpus_hash)
+        return index
+
+    # Converts the list of sequences into space-separated strings.
+    @staticmethod
+    def create_sequence_list(sequences_lists) -> list:
+        sequence_list = []
+        for sequence_list_words in sequences_lists:
+            sequence = ""
+            for i in range(len(sequence_list_words)):
+                sequence += sequence_list_words[i]
+                if i != len(sequence_list_words) - 1:
+                    sequence += " "  # Adds spaces between words except for the last one.
+            sequence_list.append(sequence)
+        return sequence_list
 
     # Iterates over each sequence and checks for occurrences in the sentences.
     # If a sequence appears in any sentence, it is added to the results.
-    def build_dict(self):
+    # Other sequences than the ones of the JSON file can be given as lists of words. Batches of at least
+    # BATCH_MIN_QUERIES distinct sequences are all found in one scan of the sentences (unless batch is False).
+    def build_dict(self, sequences_lists=None, batch=None):
         search_engine_list = []
         search_engine_dict = {}
+        sequence_list = self.sequence_list if sequences_lists is None else \
+            SearchEngine.create_sequence_list(sequences_lists)
+        # Duplicate sequences are searched for once.
+        sequence_list = sorted(set(sequence_list))  # Ensures sequences are processed in sorted order.
+        if batch is None:
+            batch = len(sequence_list) >= SearchEngine.BATCH_MIN_QUERIES
+        batch_matches = self.find_all_matching_sentences(sequence_list) if batch else None
 
-        for sequence in sorted(self.sequence_list):  # Ensures sequences are processed in sorted order.
-            sentences = self.find_sentences(sequence, self.sentences)  # Finds sentences containing the sequence.
-            if sentences and sequence not in search_engine_dict.keys():
+        for sequence in sequence_list:
+            # Finds sentences containing the sequence.
+            sentences = batch_matches[sequence] if batch else self.find_matching_sentences(sequence)
+            if sentences:
                 cleaned_sentences = []
                 for sentence in sentences:
                     cleaned_sentences.append(sentence.word_list)  # Converts sentence objects to word lists.
@@ -48,11 +121,62 @@ class SearchEngine:
 
         return json.dumps({"Question 4": {"K-Seq Matches": search_engine_list}})  # Returns results in required JSON format.
 
+    # Every new index of the sentences gets a new version, so results cached for another index are not used.
+    @property
+    def index(self):
+        return self._index
+
+    @index.setter
+    def index(self, index) -> None:
+        self._index = index
+        self.version = LruCache.new_version()
+
+    # Function returns a result cache bounded by the total number of sentence indices it keeps, as a hot sequence
+    # can be found in a large part of the corpus.
+    @staticmethod
+    def create_result_cache(max_indices=RESULT_CACHE_INDICES):
+        return LruCache(max_indices, size_of=lambda indices: len(indices) + 1)
+
+    # Finds all sentences that contain the given sequence using the index.
+    def find_matching_sentences(self, sequence):
+        return [self.sentences[index] for index in self.find_sentence_indices(sequence)]
+
+    # Finds the indices of the sentences that contain the given sequence, from the result cache if the sequence was
+    # searched for before.
+    def find_sentence_indices(self, sequence) -> list:
+        if SearchEngine.result_cache is None:
+            return self.index.sentences_containing(sequence.split())
+        # Indices are kept as a compact array rather than a list of ints.
+        return SearchEngine.result_cache.get_or_compute(
+            (self.version, sequence),
+            lambda: array(PositionalIndex.POSITION_TYPECODE, self.index.sentences_containing(sequence.split())))
+
+    # Finds the sentences that contain each of the sequences, all in one scan of the corpus with a trie of the
+    # sequences not in the result cache. Returns a dictionary from each sequence to its sentences.
+    def find_all_matching_sentences(self, sequence_list) -> dict:
+        cache = SearchEngine.result_cache
+        sentence_indices = {}
+        missing_sequences = []
+        for sequence in sequence_list:
+            indices = cache.get((self.version, sequence)) if cache is not None else None
+            if indices is None:
+                missing_sequences.append(sequence)
+            else:
+                sentence_indices[sequence] = indices
+        if missing_sequences:
+            trie = QueryTrie(self.index.corpus.vocabulary, [sequence.split() for sequence in missing_sequences])
+            for sequence, indices in zip(missing_sequences, trie.match(self.index.corpus)):
+                sentence_indices[sequence] = indices
+                if cache is not None:
+                    cache.put((self.version, sequence), array(PositionalIndex.POSITION_TYPECODE, indices))
+        return {sequence: [self.sentences[index] for index in indices]
+                for sequence, indices in sentence_indices.items()}
+
     @staticmethod
     # Finds all sentences that contain the given sequence.
     def find_sentences(seq, sentences):
         sentence_list = []
         for sentence in sentences:
-            if seq in sentence.sequence_list:  # Checks if the sequence appears in the sentence.
+            if sentence.contains_sequence(seq):  # Checks if the sequence appears in the sentence.
                 sentence_list.append(sentence)
         return sentence_list  # Returns the list of matching sentences.
@@ -0,0 +1,113 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+from Corpus import Corpus
+from CorpusFile import CorpusFile
+from PositionalIndex import PositionalIndex
+from Vocabulary import Vocabulary
+
+
+class SearchIndexFile:
+    # Positional index of a corpus saved for later Task 4 runs, memory-mapped instead of built again. The file records
+    # the hash of the inputs the corpus was made from, and an index whose hash (or version) is not the expected one is
+    # stale and built again.
+    # Layout, every section starting at a multiple of CorpusFile.ALIGNMENT bytes:
+    #   header
+    #   vocabulary       utf-8 tokens separated by newlines, token id i is line i
+    #   tokens           int32 token ids of all the sentences
+    #   offsets          int64 sentence boundaries in tokens (CSR, number of sentences + 1)
+    #   token offsets    int64 boundaries of each token's positions (CSR, vocabulary size + 1)
+    #   positions        int64 positions in tokens, grouped by token and sorted
+    MAGIC = b"IFPSIDX\x00"
+    VERSION = 1
+    # magic, version, byte order (1 for little endian), sha256 of the inputs, vocabulary size in bytes and the length
+    # of each array.
+    HEADER = struct.Struct("<8sII32s5Q")
+
+    # Function writes the index to the file, with the hash (a hex sha256) of the inputs its corpus was made from. The
+    # index is written to a temporary file first and then moved to the path, so a concurrent run never maps a partial
+    # index.
+    @staticmethod
+    def write(file_path, index, corpus_hash) -> None:
+        corpus = index.corpus
+        if corpus.offsets[0]:  # Positions must count from the start of the tokens written.
+            index = PositionalIndex(corpus.compact())
+            corpus = index.corpus
+        vocabulary_bytes = "\n".join(corpus.vocabulary.tokens).encode("utf-8")
+        sections = [vocabulary_bytes, corpus.tokens, corpus.offsets, index.token_offsets, index.positions]
+        header = SearchIndexFile.HEADER.pack(SearchIndexFile.MAGIC, SearchIndexFile.VERSION, sys.byteorder == "little",
+                                             bytes.fromhex(corpus_hash), len(vocabulary_bytes),
+                                             *[len(section) for section in sections[1:]])
+        descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(file_path)), suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(header)
+                CorpusFile.write_sections(file, sections)
+            os.replace(temp_path, file_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    # Memory-maps an index file and reads the hash of the inputs it was built from and, unless it was written by
+    # another version or with another byte order, the index over its corpus (otherwise index is None). The index
+    # arrays are views over the mapped file, which stays mapped until close (also called by the index' close and at
+    # the end of a with block). Raises ValueError, with the file already unmapped, if it is not an index file.
+    def __init__(self, file_path):
+        with open(file_path, 'rb') as file:
+            self.mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self.mapping)
+        self.sections = []
+        self.index = None
+        if len(self.buffer) < SearchIndexFile.HEADER.size:
+            self.close()
+            raise ValueError("not a search index file")
+        magic, version, little_endian, file_hash, vocabulary_size, *lengths = \
+            SearchIndexFile.HEADER.unpack_from(self.buffer)
+        if magic != SearchIndexFile.MAGIC:
+            self.close()
+            raise ValueError("not a search index file")
+        self.corpus_hash = file_hash.hex()
+        if version != SearchIndexFile.VERSION or bool(little_endian) != (sys.byteorder == "little"):
+            return
+
+        typecodes = ["B", Vocabulary.TYPECODE, Corpus.OFFSET_TYPECODE, PositionalIndex.POSITION_TYPECODE,
+                     PositionalIndex.POSITION_TYPECODE]
+        self.sections = CorpusFile.read_sections(self.buffer, SearchIndexFile.HEADER.size, typecodes,
+                                                 [vocabulary_size] + lengths)
+        vocabulary_bytes, tokens, offsets, token_offsets, positions = self.sections
+        vocabulary = Vocabulary(bytes(vocabulary_bytes).decode("utf-8").split("\n") if vocabulary_size else [])
+        self.index = PositionalIndex(Corpus(vocabulary, tokens, offsets), token_offsets, positions)
+        self.index.index_file = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # Function releases the views over the mapped file and unmaps it.
+    def close(self) -> None:
+        if self.mapping.closed:
+            return
+        if self.index is not None:
+            self.index.corpus.release()
+        for section in self.sections:
+            section.release()
+        self.buffer.release()
+        self.mapping.close()
+
+    # Function memory-maps the index file and returns the index over its corpus, or None if there is no file or it
+    # was written for other inputs, by another version or with another byte order. A file that is not used is
+    # unmapped before returning, the index returned is unmapped by its close.
+    @staticmethod
+    def read(file_path, corpus_hash):
+        if not os.path.isfile(file_path):
+            return None
+        index_file = SearchIndexFile(file_path)
+        if index_file.index is None or index_file.corpus_hash != corpus_hash:
+            index_file.close()
+            return None
+        return index_file.index
@@ -1,9 +1,16 @@
 import Data
 
 
-class Sentence(Data.Data):
-    def __init__(self, data, unwanted_words):
-        super().__init__(data)
+class CompactSentence(Data.Data):
+    # Slotted sentence that drops the original sentence string once it is cleaned.
+    # mentions is the set of persons mentioned in the sentence once computed for a list of persons (see
+    # Processor.set_mentions), otherwise None.
+    __slots__ = ('mentions',)
+    KEEP_SOURCE = False
+
+    def __init__(self, data, unwanted_words, max_sequence_length=None):
+        super().__init__(data, max_sequence_length)
+        self.mentions = None
         self.clean(unwanted_words)  # Cleans the sentence by removing unwanted words.
 
     # Function returns true if cleaned_sentence is empty string.
@@ -12,32 +19,55 @@ class Sentence(Data.Data):
 
     # Counts how many times a person's name or nickname appears in the sentence.
     def check_for_names(self, person):
-        counter = 0
-        for word in person.real_name.word_list:  # Checks for appearances of the real name.
-            if word in self.word_list:
-                counter += self.word_list.count(word)
+        counter = sum(self.count_real_name_words(person))  # Counts the appearances of the real name.
+        cleaned_data = self.cleaned_data
         for nickname in person.nicknames:  # Checks for appearances of nicknames.
             if nickname.cleaned_data != "":
-                if nickname.cleaned_data in self.cleaned_data:
-                    counter += self.cleaned_data.count(nickname.cleaned_data)
+                if nickname.cleaned_data in cleaned_data:
+                    counter += cleaned_data.count(nickname.cleaned_data)
 
         return counter
 
+    # Generator yielding how many times each word of the person's real name appears as a word of the sentence. An
+    # encoded sentence compares the integer token ids of the words instead of the words.
+    def count_real_name_words(self, person):
+        if self.token_ids is not None:
+            token_ids = self.token_ids.tolist()
+            for word in person.real_name.word_list:
+                yield token_ids.count(self.vocabulary.get_id(word))
+            return
+        word_list = self.word_list
+        for word in person.real_name.word_list:
+            yield word_list.count(word)
+
     # Returns true if the person (real name or nickname) appears in the sentence at least once.
+    # Once the mentions are computed, the person is looked up in them instead of searching the sentence.
     def check_if_person_in_sentence(self, person):
-        for word in person.real_name.word_list:  # Checks if the real name exists in the sentence.
-            if word in self.word_list:
-                return True
+        # Sentences built without __init__ (e.g. from_words) have no mentions set yet.
+        mentions = getattr(self, "mentions", None)
+        if mentions is not None:
+            return person in mentions
+        if any(self.count_real_name_words(person)):  # Checks if the real name exists in the sentence.
+            return True
+        cleaned_data = self.cleaned_data
         for nickname in person.nicknames:  # Checks if any nickname exists in the sentence.
             if nickname.cleaned_data != "":
-                if nickname.cleaned_data in self.cleaned_data:
+                if nickname.cleaned_data in cleaned_data:
                     return True
         return False  # Returns false if the person is not found.
 
     # Method takes a sentence and a threshold and checks if they have at least a threshold amount of words in common.
     def sentence_is_similar(self, sentence, threshold):
+        # Encoded sentences sharing a vocabulary are compared by their integer token ids.
+        if self.token_ids is not None and sentence.token_ids is not None and self.vocabulary is sentence.vocabulary:
+            return len(set(self.token_ids).intersection(sentence.token_ids)) >= threshold
         words_in_common = []
         for word in sentence.word_list:
             if word in self.word_list and word not in words_in_common:  # Avoids counting duplicate words.
                 words_in_common.append(word)
         return len(words_in_common) >= threshold  # Returns true if enough words are shared.
+
+
+class Sentence(CompactSentence):
+    # Sentence keeping the original string and a per-instance __dict__, so attributes can be attached to it.
+    KEEP_SOURCE = True
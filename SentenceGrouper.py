@@ -17,9 +17,11 @@ class SentenceGrouper:
             preprocessed_json = json_manager.load_json_file(preprocessed_json_file_path)
             self.sentences = preprocessed_json["Processed Sentences"]
         else:
-            # Reads sentences and removes unwanted words.
-            words_to_remove = Processor.read_csv_file(words_to_remove_file_path)
+            # Reads sentences and removes unwanted words. Sentences left empty are grouped too, so the preprocessing
+            # cache (which only keeps non empty sentences) is not used.
+            words_to_remove = Processor.read_text_cleaner(words_to_remove_file_path)
             self.sentences = Processor.read_csv_file(sentence_file, words_to_remove)
+            self.vocabulary = Processor.encode(self.sentences)  # Sentences are compared by integer token ids.
 
         self.create_sentence_nodes(self.sentences)  # Converts sentences into node objects.
         self.create_connections_between_sentences(self.sentence_nodes)  # Establishes connections based on similarity.
@@ -0,0 +1,16 @@
+from Data import Data
+from Sentence import CompactSentence
+
+
+class SentenceView(CompactSentence):
+    # A sentence backed by a range of a corpus token buffer. Nothing is copied or cleaned, the words are rebuilt from
+    # the token ids when needed.
+    __slots__ = ('index',)
+
+    def __init__(self, corpus, index):
+        Data.__init__(self, None)  # Skips the sentence cleaning, the tokens are already cleaned.
+        self.index = index  # Position of the sentence in the corpus.
+        self.token_ids = corpus.token_ids(index)
+        self.vocabulary = corpus.vocabulary
+        self.cleaned_data = None
+        self.mentions = None
@@ -3,7 +3,8 @@ class SentenceWindow:
         # List of sentences
         self.sentences = sentences
 
-    # Function iterates over sentences and finds if person exists in window
+    # Function iterates over sentences and finds if person exists in window, from the mentions of the sentences once
+    # they are set (see Processor.set_mentions).
     def find_person_in_window(self, person):
         for sentence in self.sentences:
             if sentence.check_if_person_in_sentence(person): # Check if person in sentence
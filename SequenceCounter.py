@@ -1,21 +1,48 @@
+import heapq
+import itertools
 import json
+import os
+import tempfile
+import zlib
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 
 import json_manager
+from Corpus import Corpus
+from HeavyHitters import HeavyHitters
+from JsonWriter import JsonWriter
 from Processor import Processor
+from SuffixArray import SuffixArray
 
 
 class SequenceCounter:
+    # Summaries of the approximate counting keep this many sequences per requested top sequence by default.
+    TOP_K_CAPACITY_FACTOR = 10
+    # Number of sentences counted by a worker process at a time in the parallel counting.
+    CHUNK_SIZE = 10000
+    # Default number of distinct sequences counted in memory before they are spilled to disk.
+    SPILL_THRESHOLD = 1000000
+    # Most run files merged at once by the out-of-core counting, bounding the number of open files.
+    MAX_MERGE_RUNS = 64
 
+    # With streaming set, self.sentences is a generator reading and cleaning the sentences one at a time. It can only
+    # be consumed once, by create_final_dictionary_from_stream.
     def __init__(self, preprocessed_flag, sentence_file=None, words_to_remove_file_path=None,
-                 preprocessed_json_file_path=None):
+                 preprocessed_json_file_path=None, streaming=False):
         self.sentence_list = []
         if preprocessed_flag:
-            preprocessed_json = json_manager.load_json_file(preprocessed_json_file_path)
+            preprocessed_json = json_manager.load_preprocessed_file(preprocessed_json_file_path)
             self.sentences = preprocessed_json["Question 1"]["Processed Sentences"]
+        elif Processor.cache is not None:
+            # Reuses the sentences cleaned by a previous run on the same files.
+            self.sentences, _ = Processor.load_from_cache(sentence_file, None, words_to_remove_file_path)
+        elif streaming:
+            words_to_remove = Processor.read_text_cleaner(words_to_remove_file_path)
+            self.sentences = Processor.iterate_sentences(sentence_file, words_to_remove)
         else:
             self.sentences = Processor.read_csv_file(sentence_file)
-            words_to_remove = Processor.read_csv_file(words_to_remove_file_path)
-            Processor.clean_sentences(self.sentences, words_to_remove)
+            words_to_remove = Processor.read_text_cleaner(words_to_remove_file_path)
+            self.sentences = Processor.clean_sentences(self.sentences, words_to_remove)
 
     # Function takes the length of a sequence as an input and the sentence itself and
     # returns a list of all the sequences of that length
@@ -40,11 +67,8 @@ class SequenceCounter:
     # Returns a dictionary with numbering of each sequence.
     # The keys should be sorted by alphabetical order.
     def count_each_sequence(sequence_list):
-        sequence_to_num = {}
-        for sequence in sequence_list:
-            sequence_to_num[sequence] = sequence_list.count(sequence)
-
-        return sequence_to_num
+        # Counted in a single pass, in order of first appearance.
+        return dict(Counter(sequence_list))
 
     @staticmethod
     # Turns seq_dict to key-value tuples
@@ -58,9 +82,255 @@ class SequenceCounter:
     @staticmethod
     # Function iterates from 0 to max_sequences and adds all dictionaries together
     def create_final_dictionary(max_length, sentences):
+        # All the lengths are counted in the same pass over the sentences, see count_sequences_in_stream.
+        return SequenceCounter.create_final_dictionary_from_stream(max_length, sentences)
+
+    @staticmethod
+    # Returns the words of a sentence, which is either a Sentence object or a list of words from a preprocessed file.
+    def get_word_list(sentence):
+        if isinstance(sentence, list):
+            return sentence
+        return sentence.word_list
+
+    @staticmethod
+    # Counts the sequences of every length from 1 to max_length in a single pass over the sentences, so the sentences
+    # can come from a generator and are never all held in memory. Returns a dictionary from length to the counts.
+    # Sequences are counted as tuples of words, which are hashed without building a string for every occurrence, and
+    # are only joined once per distinct sequence at the end.
+    def count_sequences_in_stream(max_length, sentences):
+        length_to_tuple_counts = SequenceCounter.count_sequence_tuples(max_length, sentences)
+        length_to_counts = {}
+        for seq_length in range(1, max_length + 1):
+            tuple_counts = length_to_tuple_counts.pop(seq_length)
+            length_to_counts[seq_length] = {" ".join(sequence): count for sequence, count in tuple_counts.items()}
+        return length_to_counts
+
+    @staticmethod
+    # Counts the sequences of every length from 1 to max_length as tuples of words. Returns a dictionary from length to
+    # a Counter.
+    def count_sequence_tuples(max_length, sentences):
+        if isinstance(sentences, Corpus):
+            return SequenceCounter.count_token_sequences(max_length, sentences)
+        length_to_tuple_counts = {seq_length: Counter() for seq_length in range(1, max_length + 1)}
+        for sentence in sentences:
+            word_list = SequenceCounter.get_word_list(sentence)
+            for seq_length in range(1, min(max_length, len(word_list)) + 1):
+                # zip of the shifted word lists yields the tuples of seq_length consecutive words.
+                length_to_tuple_counts[seq_length].update(zip(*[word_list[i:] for i in range(seq_length)]))
+        return length_to_tuple_counts
+
+    @staticmethod
+    # Counts the sequences of a corpus like count_sequence_tuples, as tuples of integer token ids read straight from its
+    # token buffer instead of words rebuilt for every sentence. Each distinct sequence is turned into words once.
+    def count_token_sequences(max_length, corpus):
+        length_to_id_counts = {seq_length: Counter() for seq_length in range(1, max_length + 1)}
+        for index in range(len(corpus)):
+            token_ids = corpus.token_ids(index).tolist()
+            for seq_length in range(1, min(max_length, len(token_ids)) + 1):
+                length_to_id_counts[seq_length].update(zip(*[token_ids[i:] for i in range(seq_length)]))
+        tokens = corpus.vocabulary.tokens
+        return {seq_length: Counter({tuple(tokens[token_id] for token_id in sequence): count
+                                     for sequence, count in id_counts.items()})
+                for seq_length, id_counts in length_to_id_counts.items()}
+
+    @staticmethod
+    # Map step of the parallel counting, run in a worker process. Counts the sequences of a chunk of word lists and
+    # splits the counts into partitions by a hash of the sequence, the same for every process. The sorted counts of
+    # each partition and length are written to a run file. Returns for each partition a dictionary from length to the
+    # path of its run (lengths without any sequence are left out).
+    def count_chunk_partitions(max_length, word_lists, partitions):
+        partitioned_counts = [{seq_length: {} for seq_length in range(1, max_length + 1)} for _ in range(partitions)]
+        for seq_length, tuple_counts in SequenceCounter.count_sequence_tuples(max_length, word_lists).items():
+            for sequence, count in tuple_counts.items():
+                sequence = " ".join(sequence)
+                partitioned_counts[zlib.crc32(sequence.encode("utf-8")) % partitions][seq_length][sequence] = count
+        return [{seq_length: SequenceCounter.write_run(SequenceCounter.turn_dict_to_list(sequence_to_num))
+                 for seq_length, sequence_to_num in length_to_counts.items() if sequence_to_num}
+                for length_to_counts in partitioned_counts]
+
+    @staticmethod
+    # Reduce step of the parallel counting, run in a worker process. Adds up the counts of a partition from the runs of
+    # all the chunks and returns for each length the path of a run with its sorted [sequence, count] pairs.
+    def merge_partition(max_length, length_to_runs):
+        return {seq_length: SequenceCounter.write_run(SequenceCounter.merge_runs(length_to_runs[seq_length]))
+                for seq_length in range(1, max_length + 1)}
+
+    @staticmethod
+    # Counts the sequences in a pool of worker processes. Chunks of sentences are counted in parallel (with only a few
+    # chunks per worker in flight, so the sentences can be streamed) into run files, then the runs of each partition
+    # of the sequences are merged in parallel. Counts go between the processes through the run files, so this process
+    # only holds their paths. Partitions hold distinct sequences, so the sorted pairs of each length are a merge of the
+    # sorted partitions. Returns a dictionary from length to an iterator of the sorted [sequence, count] pairs.
+    def count_sequences_in_parallel(max_length, sentences, workers, chunk_size=None):
+        if chunk_size is None:
+            chunk_size = SequenceCounter.CHUNK_SIZE
+        word_lists = (SequenceCounter.get_word_list(sentence) for sentence in sentences)
+        partition_runs = [{seq_length: [] for seq_length in range(1, max_length + 1)} for _ in range(workers)]
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            while True:
+                chunk = list(itertools.islice(word_lists, chunk_size))
+                if chunk:
+                    pending.append(executor.submit(SequenceCounter.count_chunk_partitions, max_length, chunk, workers))
+                if pending and (not chunk or len(pending) >= 2 * workers):
+                    for length_to_runs, chunk_runs in zip(partition_runs, pending.popleft().result()):
+                        for seq_length, run in chunk_runs.items():
+                            length_to_runs[seq_length].append(run)
+                elif not chunk:
+                    break
+            merges = [executor.submit(SequenceCounter.merge_partition, max_length, length_to_runs)
+                      for length_to_runs in partition_runs]
+            sorted_partitions = [merge.result() for merge in merges]
+        return {seq_length: heapq.merge(*[SequenceCounter.read_run(partition[seq_length])
+                                          for partition in sorted_partitions], key=lambda pair: pair[0])
+                for seq_length in range(1, max_length + 1)}
+
+    @staticmethod
+    # Counts the sequences with a bounded number of them in memory. Whenever more than spill_threshold distinct
+    # sequences are counted, the counts of each length are written sorted to a temporary run file and counting starts
+    # over. Returns a dictionary from length to an iterator of the sorted [sequence, count] pairs, a k-way merge of the
+    # runs that adds up the counts of the same sequence, so the result is never sorted or held in memory as a whole.
+    # Run files are only open while they are merged, and at most MAX_MERGE_RUNS of them at a time.
+    def count_sequences_out_of_core(max_length, sentences, spill_threshold=None):
+        if spill_threshold is None:
+            spill_threshold = SequenceCounter.SPILL_THRESHOLD
+        length_to_runs = {seq_length: [] for seq_length in range(1, max_length + 1)}
+        length_to_tuple_counts = {seq_length: Counter() for seq_length in range(1, max_length + 1)}
+        for sentence in sentences:
+            word_list = SequenceCounter.get_word_list(sentence)
+            for seq_length in range(1, min(max_length, len(word_list)) + 1):
+                length_to_tuple_counts[seq_length].update(zip(*[word_list[i:] for i in range(seq_length)]))
+            if sum(len(tuple_counts) for tuple_counts in length_to_tuple_counts.values()) > spill_threshold:
+                for seq_length, tuple_counts in length_to_tuple_counts.items():
+                    if tuple_counts:
+                        length_to_runs[seq_length].append(
+                            SequenceCounter.write_run(SequenceCounter.sort_tuple_counts(tuple_counts)))
+                        tuple_counts.clear()
+
+        length_to_sorted_counts = {}
+        for seq_length, runs in length_to_runs.items():
+            in_memory = SequenceCounter.sort_tuple_counts(length_to_tuple_counts.pop(seq_length))
+            length_to_sorted_counts[seq_length] = SequenceCounter.merge_runs(runs, [iter(in_memory)])
+        return length_to_sorted_counts
+
+    @staticmethod
+    # Returns an iterator of the sorted [sequence, count] pairs of the runs and the other sorted iterators, adding up
+    # the counts of the same sequence. Runs are first merged in groups into bigger runs until at most MAX_MERGE_RUNS
+    # files are merged at once.
+    def merge_runs(runs, sorted_iterators=()):
+        sorted_iterators = list(sorted_iterators)
+        while len(runs) + len(sorted_iterators) > SequenceCounter.MAX_MERGE_RUNS:
+            runs = [SequenceCounter.write_run(SequenceCounter.merge_sorted_counts(
+                [SequenceCounter.read_run(run) for run in runs[start:start + SequenceCounter.MAX_MERGE_RUNS]]))
+                for start in range(0, len(runs), SequenceCounter.MAX_MERGE_RUNS)]
+        return SequenceCounter.merge_sorted_counts([SequenceCounter.read_run(run) for run in runs] + sorted_iterators)
+
+    @staticmethod
+    # Returns the [sequence, count] pairs of counts of word tuples, sorted by sequence.
+    def sort_tuple_counts(tuple_counts):
+        return SequenceCounter.turn_dict_to_list({" ".join(sequence): count for sequence, count in tuple_counts.items()})
+
+    @staticmethod
+    # Writes the sorted [sequence, count] pairs to a temporary run file, one JSON pair per line, and returns its path.
+    def write_run(sorted_pairs):
+        descriptor, path = tempfile.mkstemp(suffix=".run")
+        try:
+            with open(descriptor, 'w', encoding="utf-8") as run:
+                for pair in sorted_pairs:
+                    run.write(json.dumps(pair) + "\n")
+        except BaseException:
+            os.remove(path)
+            raise
+        return path
+
+    @staticmethod
+    # Generator yielding the [sequence, count] pairs of a run file, which is only opened once the first pair is needed
+    # and removed at the end.
+    def read_run(path):
+        try:
+            with open(path, encoding="utf-8") as run:
+                for line in run:
+                    yield json.loads(line)
+        finally:
+            os.remove(path)
+
+    @staticmethod
+    # Generator merging sorted iterators of [sequence, count] pairs into one sorted iterator, adding up the counts of
+    # a sequence appearing in several of them.
+    def merge_sorted_counts(sorted_runs):
+        merged = heapq.merge(*sorted_runs, key=lambda pair: pair[0])
+        for sequence, pairs in itertools.groupby(merged, key=lambda pair: pair[0]):
+            yield [sequence, sum(count for _, count in pairs)]
+
+    @staticmethod
+    # Same output as create_final_dictionary, but reads the sentences only once.
+    def create_final_dictionary_from_stream(max_length, sentences, workers=None):
+        document = SequenceCounter.create_final_document_from_stream(max_length, sentences, workers)
+        return "".join(JsonWriter.iterate_json(document))
+
+    @staticmethod
+    # Returns the Task 2 document for writing with JsonWriter. The sorted [sequence, count] pairs of each length are
+    # generated while the document is written instead of copied into lists.
+    # With a spill threshold, at most that many distinct sequences are kept in memory (see count_sequences_out_of_core).
+    # Otherwise with more than one worker (Processor.workers by default) the sequences are counted in parallel.
+    def create_final_document_from_stream(max_length, sentences, workers=None, spill_threshold=None):
+        if workers is None:
+            workers = Processor.workers
+        if spill_threshold is not None:
+            length_to_sorted_counts = SequenceCounter.count_sequences_out_of_core(max_length, sentences, spill_threshold)
+            final_dict = {str(seq_length) + "_seq": sorted_counts
+                          for seq_length, sorted_counts in length_to_sorted_counts.items()}
+        elif workers and workers > 1:
+            length_to_sorted_counts = SequenceCounter.count_sequences_in_parallel(max_length, sentences, workers)
+            final_dict = {str(seq_length) + "_seq": sorted_counts
+                          for seq_length, sorted_counts in length_to_sorted_counts.items()}
+        else:
+            length_to_counts = SequenceCounter.count_sequences_in_stream(max_length, sentences)
+            final_dict = {str(seq_length) + "_seq": SequenceCounter.iterate_sorted_counts(sequence_to_num)
+                          for seq_length, sequence_to_num in length_to_counts.items()}
+        seq_counts = [[key, final_dict[key]] for key in sorted(final_dict)]
+        return {"Question 2": {str(max_length) + "-Seq Counts": seq_counts}}
+
+    @staticmethod
+    # Returns the Task 2 document counted with a suffix array of the sentences instead of counters. The counting work
+    # grows with the corpus and the number of distinct sequences rather than with the corpus size times max_length,
+    # which pays off for large max_length.
+    def create_final_document_with_suffix_array(max_length, sentences):
+        length_to_sorted_counts = SuffixArray.from_sentences(sentences).sequence_counts(max_length)
+        final_dict = {str(seq_length) + "_seq": sorted_counts
+                      for seq_length, sorted_counts in length_to_sorted_counts.items()}
+        seq_counts = [[key, final_dict[key]] for key in sorted(final_dict)]
+        return {"Question 2": {str(max_length) + "-Seq Counts": seq_counts}}
+
+    @staticmethod
+    # Generator yielding the [sequence, count] pairs in the order of turn_dict_to_list.
+    def iterate_sorted_counts(seq_dict):
+        for seq in sorted(seq_dict.keys()):
+            yield [seq, seq_dict[seq]]
+
+    @staticmethod
+    # Approximate version of count_sequences_in_stream for corpora too large to count every sequence. Each length keeps
+    # a HeavyHitters summary of at most capacity sequences, so memory does not grow with the corpus. Returns a
+    # dictionary from length to the summary, whose keys are tuples of words.
+    def count_heavy_hitters_in_stream(max_length, sentences, capacity=HeavyHitters.DEFAULT_CAPACITY):
+        length_to_summary = {seq_length: HeavyHitters(capacity) for seq_length in range(1, max_length + 1)}
+        for sentence in sentences:
+            word_list = SequenceCounter.get_word_list(sentence)
+            for seq_length in range(1, min(max_length, len(word_list)) + 1):
+                length_to_summary[seq_length].update(zip(*[word_list[i:] for i in range(seq_length)]))
+        return length_to_summary
+
+    @staticmethod
+    # Returns the Task 2 document with only the top_k most frequent sequences of each length (every tracked sequence if
+    # top_k is None) whose count is at least min_count, in the order of the exact output. Counts of sequences of a
+    # length with N occurrences may be overestimated by up to N / capacity, see HeavyHitters.
+    def create_top_document_from_stream(max_length, sentences, top_k=None, min_count=1, capacity=None):
+        if capacity is None:
+            capacity = max(HeavyHitters.DEFAULT_CAPACITY, SequenceCounter.TOP_K_CAPACITY_FACTOR * (top_k or 0))
         final_dict = {}
-        for i in range(1, max_length + 1):
-            seq_list = SequenceCounter.count_each_sequence(SequenceCounter.create_sequence_list(i, sentences))
-            final_dict[str(i) + "_seq"] = SequenceCounter.turn_dict_to_list(seq_list)
+        length_to_summary = SequenceCounter.count_heavy_hitters_in_stream(max_length, sentences, capacity)
+        for seq_length, summary in length_to_summary.items():
+            top_counts = {" ".join(sequence): count for sequence, count in summary.most_common(top_k, min_count)}
+            final_dict[str(seq_length) + "_seq"] = SequenceCounter.turn_dict_to_list(top_counts)
 
-        return json.dumps({"Question 2": {str(max_length) + "-Seq Counts": SequenceCounter.turn_dict_to_list(final_dict)}})
+        return {"Question 2": {str(max_length) + "-Seq Counts": SequenceCounter.turn_dict_to_list(final_dict)}}
@@ -0,0 +1,227 @@
+from array import array
+from bisect import bisect_right
+
+from Corpus import Corpus
+
+
+class SuffixArray:
+    # Suffix array with LCP over the token stream of a corpus. The sentences are laid out one after the other, each
+    # followed by a separator unique to it, so no match runs from one sentence into the next. Once built it answers:
+    #   - the count of every distinct sequence of any length (sequence_counts), in one pass over the index,
+    #   - the distinct sequences up to a length in sorted order (iterate_distinct_sequences), also of only some of the
+    #     sentences (iterate_distinct_sequences_of),
+    #   - the sentences containing a sequence (sentences_containing), by binary search.
+    # Tokens are ranked by their words, so suffixes are sorted like lists of words. For words without characters up
+    # to a space (always the case for cleaned words) that is also the order of the space-joined sequences.
+    INDEX_TYPECODE = 'q'
+
+    def __init__(self, corpus):
+        self.corpus = corpus
+        vocabulary = corpus.vocabulary
+        sentence_count = len(corpus)
+        # Separator of sentence i has rank i, words are ranked after all the separators in the order of the words.
+        word_ids = sorted(range(len(vocabulary)), key=vocabulary.tokens.__getitem__)
+        self.rank_of_id = [0] * len(vocabulary)
+        for rank, word_id in enumerate(word_ids, sentence_count):
+            self.rank_of_id[word_id] = rank
+
+        text = []
+        # Position of each sentence's separator in the text.
+        self.separators = array(SuffixArray.INDEX_TYPECODE)
+        for index in range(sentence_count):
+            text.extend(self.rank_of_id[token_id] for token_id in corpus.token_ids(index))
+            self.separators.append(len(text))
+            text.append(index)
+        self.text = array(SuffixArray.INDEX_TYPECODE, text)
+        # Number of words from each position to the end of its sentence.
+        self.remaining = array(SuffixArray.INDEX_TYPECODE, [0] * len(text))
+        start = 0
+        for separator in self.separators:
+            for position in range(start, separator):
+                self.remaining[position] = separator - position
+            start = separator + 1
+
+        self.suffix_array = SuffixArray.build_suffix_array(text)
+        self.lcp = SuffixArray.build_lcp(text, self.suffix_array)
+        # Index in the suffix array of the suffix starting at each position.
+        self.rank = array(SuffixArray.INDEX_TYPECODE, [0] * len(text))
+        for i, position in enumerate(self.suffix_array):
+            self.rank[position] = i
+        self._words_by_rank = None
+
+    # Builds a suffix array from the corpus of the sentences (or word lists from a preprocessed file). A corpus, e.g.
+    # from a binary corpus file, is used as it is.
+    @staticmethod
+    def from_sentences(sentences):
+        if isinstance(sentences, Corpus):
+            return SuffixArray(sentences)
+        return SuffixArray(Corpus.from_word_lists(sentence if isinstance(sentence, list) else sentence.word_list
+                                                  for sentence in sentences))
+
+    # Function sorts the suffixes of the text by prefix doubling: each round sorts them by the ranks of their first
+    # 2k symbols, given the ranks of their first k. Separators are unique, so it stops after log2 of the longest
+    # sentence rounds.
+    @staticmethod
+    def build_suffix_array(text) -> array:
+        length = len(text)
+        suffix_array = sorted(range(length), key=text.__getitem__)
+        if length < 2:
+            return array(SuffixArray.INDEX_TYPECODE, suffix_array)
+        rank = [0] * length
+        keys = text
+        step = 1
+        while True:
+            classes = 0
+            for i in range(length):
+                if i and keys[suffix_array[i]] != keys[suffix_array[i - 1]]:
+                    classes += 1
+                rank[suffix_array[i]] = classes
+            if classes == length - 1:
+                break
+            # A suffix's key is its rank followed by the rank of the suffix step symbols later.
+            keys = [rank[i] * (length + 1) + (rank[i + step] + 1 if i + step < length else 0) for i in range(length)]
+            suffix_array.sort(key=keys.__getitem__)
+            step *= 2
+        return array(SuffixArray.INDEX_TYPECODE, suffix_array)
+
+    # Function returns the length of the longest common prefix of each suffix with the one before it in the suffix
+    # array (Kasai's algorithm).
+    @staticmethod
+    def build_lcp(text, suffix_array) -> array:
+        length = len(text)
+        rank = [0] * length
+        for i, position in enumerate(suffix_array):
+            rank[position] = i
+        lcp = array(SuffixArray.INDEX_TYPECODE, [0] * length)
+        common = 0
+        for position in range(length):
+            if rank[position] == 0:
+                common = 0
+                continue
+            previous = suffix_array[rank[position] - 1]
+            while position + common < length and previous + common < length and \
+                    text[position + common] == text[previous + common]:
+                common += 1
+            lcp[rank[position]] = common
+            if common:
+                common -= 1
+        return lcp
+
+    # Function returns the index of the sentence the position in the text belongs to.
+    def get_sentence_index(self, position) -> int:
+        return bisect_right(self.separators, position - 1)
+
+    # Generator yielding (length, sequence, count) for every distinct sequence of at most max_length words, with the
+    # sequences of each length in sorted order. Suffixes sharing a prefix of length k are adjacent with an LCP of at
+    # least k between them, so a scan of the LCP array finds them all. Only the lengths that start or end a group at
+    # each suffix are visited, and a suffix shares the strings of its common prefix with the suffix before it, so the
+    # work grows with the corpus and the number of distinct sequences, not with the corpus size times max_length.
+    def iterate_sequence_groups(self, max_length):
+        words_by_rank = self.get_words_by_rank()
+        # Index in the suffix array where the current group of each length started and its sequence, which is also
+        # the prefix of that length of the current suffix.
+        group_starts = [0] * (max_length + 1)
+        prefixes = [""] * (max_length + 1)
+        previous_length = 0
+        for i, position in enumerate(self.suffix_array):
+            common = min(self.lcp[i], max_length)
+            for length in range(previous_length, common, -1):
+                yield length, prefixes[length], i - group_starts[length]
+            current_length = min(self.remaining[position], max_length)
+            for length in range(common + 1, current_length + 1):
+                group_starts[length] = i
+                word = words_by_rank[self.text[position + length - 1]]
+                prefixes[length] = prefixes[length - 1] + " " + word if length > 1 else word
+            previous_length = current_length
+        for length in range(previous_length, 0, -1):
+            yield length, prefixes[length], len(self.suffix_array) - group_starts[length]
+
+    # Function returns for each length from 1 to max_length the sorted [sequence, count] pairs of all its sequences,
+    # like SequenceCounter.count_sequences_in_stream but already sorted.
+    def sequence_counts(self, max_length) -> dict:
+        length_to_counts = {length: [] for length in range(1, max_length + 1)}
+        for length, sequence, count in self.iterate_sequence_groups(max_length):
+            length_to_counts[length].append([sequence, count])
+        if not self.is_sorted_like_strings():
+            for sorted_counts in length_to_counts.values():
+                sorted_counts.sort()
+        return length_to_counts
+
+    # Generator yielding the words of every distinct sequence of at most max_length words, sorted like lists of words
+    # (so a sequence comes right before its extensions).
+    def iterate_distinct_sequences(self, max_length):
+        words_by_rank = self.get_words_by_rank()
+        prefix = []
+        for i, position in enumerate(self.suffix_array):
+            common = min(self.lcp[i], max_length)
+            del prefix[common:]
+            for length in range(common + 1, min(self.remaining[position], max_length) + 1):
+                prefix.append(words_by_rank[self.text[position + length - 1]])
+                yield list(prefix)
+
+    # Generator like iterate_distinct_sequences, but only for the sequences of the sentences with the given indices.
+    # Only the suffixes of these sentences are visited, in suffix array order, and each is compared with the one
+    # before it for at most max_length words, so the work grows with the size of these sentences, not the corpus.
+    def iterate_distinct_sequences_of(self, sentence_indices, max_length):
+        words_by_rank = self.get_words_by_rank()
+        ranks = sorted(self.rank[position] for sentence_index in sentence_indices
+                       for position in range(self.separators[sentence_index - 1] + 1 if sentence_index else 0,
+                                             self.separators[sentence_index]))
+        prefix = []
+        previous_position = None
+        for rank in ranks:
+            position = self.suffix_array[rank]
+            length = min(self.remaining[position], max_length)
+            common = 0
+            if previous_position is not None:
+                limit = min(length, len(prefix))
+                while common < limit and self.text[previous_position + common] == self.text[position + common]:
+                    common += 1
+            del prefix[common:]
+            for prefix_length in range(common + 1, length + 1):
+                prefix.append(words_by_rank[self.text[position + prefix_length - 1]])
+                yield list(prefix)
+            previous_position = position
+
+    # Function returns the word of each rank, None for the separators.
+    def get_words_by_rank(self) -> list:
+        if self._words_by_rank is None:
+            self._words_by_rank = [None] * (len(self.corpus) + len(self.rank_of_id))
+            for word_id, rank in enumerate(self.rank_of_id):
+                self._words_by_rank[rank] = self.corpus.vocabulary.tokens[word_id]
+        return self._words_by_rank
+
+    # Function checks if sorting sequences as lists of words is the same as sorting them as space-joined strings.
+    def is_sorted_like_strings(self) -> bool:
+        return all(word and min(word) > " " for word in self.corpus.vocabulary.tokens)
+
+    # Function returns the range of the suffix array whose suffixes start with the words.
+    def find(self, words):
+        ranks = []
+        for word in words:
+            word_id = self.corpus.vocabulary.get_id(word)
+            if word_id == -1:
+                return 0, 0
+            ranks.append(self.rank_of_id[word_id])
+        if not ranks:
+            return 0, 0
+        return self.bisect(ranks, False), self.bisect(ranks, True)
+
+    # Function returns the first index of the suffix array whose suffix's prefix is greater than the ranks (or at
+    # least the ranks, if not right).
+    def bisect(self, ranks, right) -> int:
+        low, high = 0, len(self.suffix_array)
+        while low < high:
+            middle = (low + high) // 2
+            position = self.suffix_array[middle]
+            prefix = list(self.text[position:position + len(ranks)])
+            if prefix < ranks or (right and prefix == ranks):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    # Function returns the sorted indices of the sentences containing the words as consecutive words.
+    def sentences_containing(self, words) -> list:
+        start, end = self.find(words)
+        return sorted({self.get_sentence_index(position) for position in self.suffix_array[start:end]})
@@ -0,0 +1,32 @@
+import re
+
+
+class TextCleaner:
+    # Bumped whenever the cleaning rules change, so anything derived from cleaned text can be invalidated.
+    VERSION = 1
+
+    # Words are the runs of characters that are not punctuation -> numbers and letters.
+    WORD_PATTERN = re.compile(r'[A-Za-z0-9]+')
+
+    def __init__(self, unwanted_words=None):
+        self.unwanted_words = frozenset(unwanted_words) if unwanted_words else frozenset()
+
+    # Returns a cleaner for the given unwanted words, reusing it if it is already a cleaner.
+    @staticmethod
+    def create(unwanted_words=None):
+        if isinstance(unwanted_words, TextCleaner):
+            return unwanted_words
+        return TextCleaner(unwanted_words)
+
+    # Function lowercases the text and splits it to words in a single pass, dropping the unwanted words.
+    # Equivalent to lowercasing, replacing punctuation with whitespace, removing unwanted words and splitting.
+    def tokenize(self, text: str) -> list:
+        words = self.WORD_PATTERN.findall(text.lower())
+        if self.unwanted_words:
+            unwanted_words = self.unwanted_words
+            return [word for word in words if word not in unwanted_words]
+        return words
+
+    # Function returns the cleaned text as a single string of words separated by spaces.
+    def clean(self, text: str) -> str:
+        return " ".join(self.tokenize(text))
@@ -0,0 +1,40 @@
+from array import array
+
+
+class Vocabulary:
+    # Type code of the arrays holding token ids (signed int).
+    TYPECODE = 'i'
+
+    def __init__(self, tokens=None):
+        self.tokens = []  # Maps id -> token.
+        self.token_to_id = {}  # Maps token -> id.
+        for token in tokens or []:
+            self.intern(token)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def __contains__(self, token):
+        return token in self.token_to_id
+
+    # Function returns the id of the token, adding it to the vocabulary if it is new.
+    def intern(self, token: str) -> int:
+        token_id = self.token_to_id.get(token)
+        if token_id is None:
+            token_id = len(self.tokens)
+            self.token_to_id[token] = token_id
+            self.tokens.append(token)
+        return token_id
+
+    # Function returns the id of the token, or -1 if it is not in the vocabulary.
+    def get_id(self, token: str) -> int:
+        return self.token_to_id.get(token, -1)
+
+    # Function turns a list of words to a compact array of token ids, adding new words to the vocabulary.
+    def encode(self, words) -> array:
+        return array(self.TYPECODE, [self.intern(word) for word in words])
+
+    # Function turns token ids back to the list of words they stand for.
+    def decode(self, token_ids) -> list:
+        tokens = self.tokens
+        return [tokens[token_id] for token_id in token_ids]
@@ -1,6 +1,15 @@
 import json
 
+from CorpusFile import CorpusFile
+
 # Generic function that loads the json dictionary from a json file.
 def load_json_file(filepath):
     with open(filepath, 'r', encoding='utf-8') as f:
         return json.load(f)
+
+
+# Function loads a preprocessed file, either the Task 1 JSON or a binary corpus file (detected by its magic bytes).
+def load_preprocessed_file(filepath):
+    if CorpusFile.is_corpus_file(filepath):
+        return CorpusFile.load_document(filepath)
+    return load_json_file(filepath)
@@ -3,9 +3,13 @@ import os
 import sys
 from webbrowser import Error
 
+from JsonWriter import JsonWriter
+from LruCache import LruCache
+from PreprocessingCache import PreprocessingCache
 from Processor import Processor
 from SequenceCounter import SequenceCounter
 from PersonCounter import PersonCounter
+from QueryServer import QueryServer
 from SearchEngine import SearchEngine
 from ContextFinder import ContextFinder
 from DirectNeighborsFinder import DirectNeighborsFinder
@@ -22,16 +26,31 @@ def parse_arguments():
     # Input files for various tasks.
     parser.add_argument("-s", nargs="+", type=valid_file, required=False)  # Sentence and name files.
     parser.add_argument("-r", type=valid_file, required=False)  # Remove words file.
-    parser.add_argument("--preprocessed", type=valid_file, required=False)  # Preprocessed JSON file.
+    parser.add_argument("--preprocessed", type=valid_file, required=False)  # Preprocessed JSON or binary corpus file.
+    parser.add_argument("--binary_output", required=False)  # Task 1: Also write a binary corpus file to this path.
+    parser.add_argument("--append", type=valid_file, required=False)  # Task 1: Preprocessed file to add the inputs to.
 
     # Additional arguments for specific tasks.
     parser.add_argument("--qsek_query_path", type=valid_file, required=False)  # Task 4: Query sequence file.
+    parser.add_argument("--search_index", required=False)  # Task 4: Index file of the sentences, built once and reused.
     parser.add_argument("--maxk", type=int, required=False)  # Task 5: Maximum k parameter.
     parser.add_argument("--windowsize", type=int, required=False)  # Tasks 6, 7, 8: Window size for context.
     parser.add_argument("--pairs", type=valid_file, required=False)  # Task 7: Pairs of names for checking connections.
     parser.add_argument("--maximal_distance", type=int, required=False)  # Task 7: Maximum distance for indirect connections.
     parser.add_argument("--fixed_length", type=int, required=False)  # Task 8: Fixed length path for indirect connections.
     parser.add_argument("--threshold", type=int, required=False)  # Tasks 6, 7, 8, 9: Threshold for grouping.
+    parser.add_argument("--workers", type=int, required=False)  # All tasks: Worker processes used for cleaning.
+    parser.add_argument("--cache_dir", required=False)  # All tasks: Directory of the preprocessing cache.
+    parser.add_argument("--cache_max_mb", type=int, required=False)  # All tasks: Size limit of the preprocessing cache.
+    parser.add_argument("--topk", type=int, required=False)  # Task 2: Approximate counts of the k most common sequences.
+    parser.add_argument("--min_count", type=int, required=False)  # Task 2: Approximate counts of sequences this common.
+    parser.add_argument("--counter_capacity", type=int, required=False)  # Task 2: Sequences tracked per length.
+    parser.add_argument("--spill_threshold", type=int, required=False)  # Task 2: Sequences counted in memory before spilling to disk.
+    parser.add_argument("--suffix_array", action="store_true")  # Tasks 2, 4, 5: Use a suffix array of the sentences.
+    parser.add_argument("--output", required=False)  # All tasks: File to write the result to instead of stdout.
+    parser.add_argument("--serve", type=int, required=False)  # Tasks 4, 7: Answer queries sent to this port (0 for any free port).
+    parser.add_argument("--host", required=False)  # Tasks 4, 7: Address the server listens on, localhost by default.
+    parser.add_argument("--result_cache_size", type=int, required=False)  # Tasks 4, 7: Sentence indices (Task 4) or pairs (Task 7) of query results kept in memory, 0 to disable. On by default with --serve.
 
     return parser.parse_args()
 
@@ -43,20 +62,60 @@ def valid_file(path):
     return path
 
 
+# Function writes a task's result to the output, either a JSON string or a document written piece by piece.
+def write_result(result, output):
+    if isinstance(result, str):
+        output.write(result + "\n")
+    else:
+        JsonWriter.write(result, output)
+
+
 def run_program():
+    output = sys.stdout
     try:
         args_dict = vars(parse_arguments())  # Parses arguments into a dictionary.
 
         # Remove None values to avoid errors when accessing dictionary keys.
         provided_args = {argument: value for argument, value in args_dict.items() if value is not None}
 
+        # Preprocessing of every task is done by this many worker processes.
+        Processor.workers = provided_args.get("workers")
+        # Cleaned sentences and names are reused between runs on the same files.
+        if "cache_dir" in provided_args:
+            max_bytes = provided_args.get("cache_max_mb", PreprocessingCache.DEFAULT_MAX_BYTES // (1024 * 1024)) * 1024 * 1024
+            Processor.cache = PreprocessingCache(provided_args["cache_dir"], max_bytes)
+        # Results of repeated sequence and pair queries are kept, by default only by a server.
+        if "result_cache_size" in provided_args:
+            cache_size = provided_args["result_cache_size"]
+            SearchEngine.result_cache = SearchEngine.create_result_cache(cache_size) if cache_size > 0 else None
+            IndirectConnectionFinder.result_cache = LruCache(cache_size) if cache_size > 0 else None
+        elif "serve" in provided_args:
+            SearchEngine.result_cache = SearchEngine.create_result_cache()
+            IndirectConnectionFinder.result_cache = LruCache()
+        # Results are written to stdout unless an output file is given.
+        if "output" in provided_args:
+            output = open(provided_args["output"], 'w', encoding='utf-8')
+
         # Task 1: Processes text data for further analysis.
         if provided_args["t"] == 1:
             remove_words_path = provided_args["r"]
             sentence_file_path = provided_args["s"][0]
-            people_file_path = provided_args["s"][1]
 
-            print(Processor.output_to_json(sentence_file_path, people_file_path, remove_words_path))
+            if "append" in provided_args:
+                # Only the new sentences (and names, if given) are cleaned and added to the preprocessed file's data.
+                people_file_path = provided_args["s"][1] if len(provided_args["s"]) > 1 else None
+                processed_sentences, processed_names = Processor.append_preprocessed(
+                    provided_args["append"], sentence_file_path, people_file_path, remove_words_path,
+                    provided_args.get("workers"))
+            else:
+                people_file_path = provided_args["s"][1]
+                # Unless a binary file is also written, the sentences are cleaned while they are written out.
+                processed_sentences, processed_names = Processor.preprocess(sentence_file_path, people_file_path,
+                                                                            remove_words_path, provided_args.get("workers"),
+                                                                            streaming="binary_output" not in provided_args)
+            if "binary_output" in provided_args:
+                Processor.output_to_binary(provided_args["binary_output"], processed_sentences, processed_names)
+            write_result(Processor.create_document(processed_sentences, processed_names), output)
 
         # Task 2: Finds common word sequences in the text.
         elif provided_args["t"] == 2:
@@ -64,10 +123,20 @@ def run_program():
             if "preprocessed" in provided_args and provided_args["preprocessed"] is not None:
                 counter = SequenceCounter(True, preprocessed_json_file_path=provided_args["preprocessed"])
             else:
-                counter = SequenceCounter(False, sentence_file=provided_args["s"][0], words_to_remove_file_path=provided_args["r"])
-
-            result = SequenceCounter.create_final_dictionary(maxk, counter.sentences)
-            print(result)
+                counter = SequenceCounter(False, sentence_file=provided_args["s"][0], words_to_remove_file_path=provided_args["r"], streaming=True)
+
+            # Sentences are counted as they are read.
+            if "topk" in provided_args or "min_count" in provided_args:
+                # Only the most common sequences are counted, in a fixed amount of memory.
+                result = SequenceCounter.create_top_document_from_stream(maxk, counter.sentences, provided_args.get("topk"),
+                                                                         provided_args.get("min_count", 1),
+                                                                         provided_args.get("counter_capacity"))
+            elif provided_args["suffix_array"]:
+                result = SequenceCounter.create_final_document_with_suffix_array(maxk, counter.sentences)
+            else:
+                result = SequenceCounter.create_final_document_from_stream(maxk, counter.sentences,
+                                                                           spill_threshold=provided_args.get("spill_threshold"))
+            write_result(result, output)
 
 
         # Task 3: Counts appearances of specific people in the text.
@@ -75,29 +144,44 @@ def run_program():
             if "preprocessed" in provided_args and provided_args["preprocessed"] is not None:
                 counter = PersonCounter(True, preprocessed_json_file_path=provided_args["preprocessed"])
             else:
-                counter = PersonCounter(False, name_file=provided_args["s"][1], sentence_file=provided_args["s"][0], words_to_remove_file_path=provided_args["r"])
+                counter = PersonCounter(False, name_file=provided_args["s"][1], sentence_file=provided_args["s"][0], words_to_remove_file_path=provided_args["r"], streaming=True)
 
-            print(counter.count_person_appearances())
+            write_result(counter.count_person_appearances(), output)
 
         # Task 4: Searches for sequences in the text.
         elif provided_args["t"] == 4:
-            qseq_json_path = provided_args["qsek_query_path"]
-            if "preprocessed" in provided_args and provided_args["preprocessed"] is not None:
-                engine = SearchEngine(preprocessed_flag=True, preprocessed_json_file_path=provided_args["preprocessed"], seq_json_path=qseq_json_path)
+            qseq_json_path = provided_args.get("qsek_query_path")
+            search_index_path = provided_args.get("search_index")
+            preprocessed_flag = "preprocessed" in provided_args and provided_args["preprocessed"] is not None
+            if qseq_json_path is None and search_index_path is not None and "serve" not in provided_args:
+                # Without queries only the index is built (or checked to be up to date) for the next runs.
+                if preprocessed_flag:
+                    index = SearchEngine.load_index(search_index_path, True, preprocessed_json_file_path=provided_args["preprocessed"])
+                else:
+                    index = SearchEngine.load_index(search_index_path, False, sentence_file=provided_args["s"][0], words_to_remove_file_path=provided_args["r"])
+                index.close()
+                return
+
+            if preprocessed_flag:
+                engine = SearchEngine(preprocessed_flag=True, preprocessed_json_file_path=provided_args["preprocessed"], seq_json_path=qseq_json_path, suffix_array=provided_args["suffix_array"], search_index_path=search_index_path)
             else:
-                engine = SearchEngine(seq_json_path=qseq_json_path, sentence_file=provided_args["s"][0], words_to_remove_file_path=provided_args["r"], preprocessed_flag=False)
+                engine = SearchEngine(seq_json_path=qseq_json_path, sentence_file=provided_args["s"][0], words_to_remove_file_path=provided_args["r"], preprocessed_flag=False, suffix_array=provided_args["suffix_array"], search_index_path=search_index_path)
 
-            print(engine.build_dict())
+            if "serve" in provided_args:
+                # The sentences and index stay loaded and answer the queries sent by clients.
+                QueryServer(search_engine=engine).serve_forever(provided_args.get("host", QueryServer.DEFAULT_HOST), provided_args["serve"])
+                return
+            write_result(engine.build_dict(), output)
 
         # Task 5: Finds context (sequences) for names appearing in the text.
         elif provided_args["t"] == 5:
             maxk = provided_args["maxk"]
             if "preprocessed" in provided_args and provided_args["preprocessed"] is not None:
-                context_finder = ContextFinder(preprocessed_flag=True, preprocessed_json_file_path=provided_args["preprocessed"])
+                context_finder = ContextFinder(preprocessed_flag=True, preprocessed_json_file_path=provided_args["preprocessed"], suffix_array=provided_args["suffix_array"])
             else:
-                context_finder = ContextFinder(name_file=provided_args["s"][1], sentence_file=provided_args["s"][0], words_to_remove_file_path=provided_args["r"], preprocessed_flag=False)
+                context_finder = ContextFinder(name_file=provided_args["s"][1], sentence_file=provided_args["s"][0], words_to_remove_file_path=provided_args["r"], preprocessed_flag=False, suffix_array=provided_args["suffix_array"])
 
-            print(context_finder.find_all_contexts(maxk))
+            write_result(context_finder.find_all_contexts(maxk), output)
 
         # Task 6: Finds direct connections of people in the text.
         elif provided_args["t"] == 6:
@@ -109,18 +193,22 @@ def run_program():
                 neighbor_finder = DirectNeighborsFinder(name_file=provided_args["s"][1], sentence_file=provided_args["s"][0], words_to_remove_file_path=provided_args["r"], preprocessed_flag=False, window_size=window_size, threshold=threshold)
 
             neighbor_finder.find_connections()
-            print(neighbor_finder.return_connections())
+            write_result(neighbor_finder.return_connections(), output)
 
         # Task 7: Finds indirect connections between people.
         elif provided_args["t"] == 7:
-            maximal_distance = provided_args["maximal_distance"]
-            pairs = provided_args["pairs"]
+            maximal_distance = provided_args.get("maximal_distance")
+            pairs = provided_args.get("pairs")
             if "preprocessed" in provided_args and provided_args["preprocessed"] is not None:
                 connection_finder = IndirectConnectionFinder(True, pairs, maximal_distance, preprocessed_json_file_path=provided_args["preprocessed"])
             else:
                 connection_finder = IndirectConnectionFinder(False, pairs, maximal_distance, name_file=provided_args["s"][1], sentence_file=provided_args["s"][0], words_to_remove_file_path=provided_args["r"], window_size=provided_args["windowsize"], threshold=provided_args["threshold"])
 
-            print(connection_finder.find_indirect_connections())
+            if "serve" in provided_args:
+                # The connection graph stays loaded and answers the pairs sent by clients.
+                QueryServer(connection_finder=connection_finder).serve_forever(provided_args.get("host", QueryServer.DEFAULT_HOST), provided_args["serve"])
+                return
+            write_result(connection_finder.find_indirect_connections(), output)
 
         # Task 8: Finds indirect connections of a fixed length.
         elif provided_args["t"] == 8:
@@ -131,7 +219,7 @@ def run_program():
             else:
                 connection_finder = IndirectConnectionFinder(False, pairs, name_file=provided_args["s"][1], sentence_file=provided_args["s"][0], words_to_remove_file_path=provided_args["r"], window_size=provided_args["windowsize"], threshold=provided_args["threshold"])
 
-            print(connection_finder.find_indirect_connections_fixed_length(fixed_length))
+            write_result(connection_finder.find_indirect_connections_fixed_length(fixed_length), output)
 
         # Task 9: Groups related sentences together.
         elif provided_args["t"] == 9:
@@ -141,7 +229,7 @@ def run_program():
             else:
                 grouper = SentenceGrouper(False, sentence_file=provided_args["s"][0], words_to_remove_file_path=provided_args["r"], threshold=threshold)
 
-            print(grouper.return_groups(grouper.find_interconnected_groups()))
+            write_result(grouper.return_groups(grouper.find_interconnected_groups()), output)
         else:
             print("invalid input")  # Ensures an invalid task number results in an error.
             sys.exit(1)
@@ -149,6 +237,9 @@ def run_program():
     except Exception:
         print("invalid input")  # Handles unexpected errors gracefully.
         sys.exit(1)
+    finally:
+        if output is not sys.stdout:
+            output.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+import os
+import pickle
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Corpus import Corpus
+from Person import Person
+from Processor import Processor
+from Sentence import Sentence
+from SentenceView import SentenceView
+from SentenceWindow import SentenceWindow
+
+
+# Test suite for Corpus
+class TestCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.sentences = [Sentence("Alice went home", unwanted_words=[]),
+                          Sentence("Bob went to the market", unwanted_words=[]),
+                          Sentence("Alice and Bob met", unwanted_words=[])]
+        self.corpus = Processor.build_corpus(self.sentences)
+
+    # Test that the corpus keeps every sentence's words in one buffer with offsets.
+    def test_from_sentences(self):
+        self.assertEqual(len(self.corpus), 3)
+        self.assertEqual(list(self.corpus.offsets), [0, 3, 8, 12])
+        self.assertEqual(self.corpus.word_lists(), [sentence.word_list for sentence in self.sentences])
+
+    # Test that indexing returns sentence views that behave like sentences.
+    def test_sentence_view(self):
+        view = self.corpus[-1]
+        self.assertIsInstance(view, SentenceView)
+        self.assertEqual(view.index, 2)
+        self.assertEqual(view.cleaned_data, "alice and bob met")
+        self.assertEqual(view.create_sequence_list(3), ["alice and bob", "and bob met"])
+        person = Person("Bob", "")
+        person.clean([])
+        self.assertTrue(view.check_if_person_in_sentence(person))
+        with self.assertRaises(IndexError):
+            self.corpus[3]
+
+    # Test that slices share the token buffer and can be used as sentence windows.
+    def test_slice(self):
+        window = self.corpus[1:3]
+        self.assertEqual(len(window), 2)
+        self.assertIs(window.tokens.obj, self.corpus.tokens.obj)
+        self.assertEqual([sentence.word_list[0] for sentence in window], ["bob", "alice"])
+        person = Person("Alice", "")
+        person.clean([])
+        self.assertTrue(SentenceWindow(window).find_person_in_window(person))
+        self.assertFalse(SentenceWindow(self.corpus[1:2]).find_person_in_window(person))
+
+    # Test that a pickled slice only carries the tokens it refers to.
+    def test_pickle(self):
+        restored = pickle.loads(pickle.dumps(self.corpus[1:3]))
+        self.assertEqual(list(restored.offsets), [0, 5, 9])
+        self.assertEqual(restored.word_lists(), self.corpus.word_lists()[1:])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import json_manager
+from Corpus import Corpus
+from CorpusFile import CorpusFile
+from Processor import Processor
+
+
+# Test suite for the binary corpus file
+class TestCorpusFile(unittest.TestCase):
+
+    def setUp(self):
+        temp = tempfile.NamedTemporaryFile(delete=False, suffix=".bin")
+        temp.close()
+        self.file_name = temp.name
+        self.sentences = [["harry", "met", "ron"], ["ron", "smiled"], ["hermione", "read", "book"]]
+        self.names = [[["harry", "potter"], [["boy", "lived"], ["harry"]]], [["ron", "weasley"], []]]
+
+    def tearDown(self):
+        os.remove(self.file_name)
+
+    # Test that the sentences and names read back are the ones written.
+    def test_write_read(self):
+        Processor.output_to_binary(self.file_name, self.sentences, self.names)
+        self.assertTrue(CorpusFile.is_corpus_file(self.file_name))
+        corpus, names = CorpusFile.read(self.file_name)
+        self.assertIsInstance(corpus, Corpus)
+        self.assertEqual(corpus.word_lists(), self.sentences)
+        self.assertEqual(names, self.names)
+        self.assertEqual(corpus[1].cleaned_data, "ron smiled")
+        corpus.close()
+
+    # Test that the file is unmapped at the end of a with block, so it can be written again.
+    def test_close(self):
+        Processor.output_to_binary(self.file_name, self.sentences, self.names)
+        with CorpusFile(self.file_name) as corpus_file:
+            self.assertEqual(corpus_file.corpus.word_lists(), self.sentences)
+            self.assertEqual(corpus_file.processed_names, self.names)
+        self.assertTrue(corpus_file.mapping.closed)
+        Processor.output_to_binary(self.file_name, self.sentences[:1], [])
+        corpus, names = CorpusFile.read(self.file_name)
+        self.assertEqual((corpus.word_lists(), names), (self.sentences[:1], []))
+        corpus.close()
+
+    # Test that load_preprocessed_file loads binary files as a Task 1 document with persons and JSON files as JSON.
+    def test_load_preprocessed_file(self):
+        Processor.output_to_binary(self.file_name, self.sentences, self.names)
+        document = json_manager.load_preprocessed_file(self.file_name)["Question 1"]
+        self.assertEqual([sentence.word_list for sentence in document["Processed Sentences"]], self.sentences)
+        persons = document["Persons"]
+        self.assertEqual([person.real_name.cleaned_data for person in persons], ["harry potter", "ron weasley"])
+        self.assertEqual(persons[0].return_nickname_list(), ["boy lived", "harry"])
+        self.assertEqual(document["Processed Sentences"][0].check_for_names(persons[0]), 2)
+        document["Processed Sentences"].close()  # The file is unmapped before it is written again.
+
+        with open(self.file_name, 'w', encoding='utf-8') as file:
+            json.dump({"Question 1": {"Processed Sentences": self.sentences}}, file)
+        self.assertFalse(CorpusFile.is_corpus_file(self.file_name))
+        self.assertEqual(json_manager.load_preprocessed_file(self.file_name)["Question 1"]["Processed Sentences"],
+                         self.sentences)
+
+    # Test that appending to a binary file unmaps it once its sentences are copied, so the result can replace it.
+    def test_append_unmaps_file(self):
+        Processor.output_to_binary(self.file_name, self.sentences, self.names)
+        sentence_file = tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8")
+        sentence_file.write("sentence\nDobby freed\n")
+        sentence_file.close()
+        common_file = tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8")
+        common_file.write("common\nthe\n")
+        common_file.close()
+        try:
+            with patch.object(CorpusFile, "close", autospec=True, side_effect=CorpusFile.close) as close:
+                processed_sentences, processed_names = Processor.append_preprocessed(
+                    self.file_name, sentence_file.name, None, common_file.name)
+            self.assertTrue(close.call_args[0][0].mapping.closed)
+            Processor.output_to_binary(self.file_name, processed_sentences, processed_names)
+            corpus, names = CorpusFile.read(self.file_name)
+            self.assertEqual(corpus.word_lists(), self.sentences + [["dobby", "freed"]])
+            self.assertEqual(names, self.names)
+            corpus.close()
+        finally:
+            os.remove(sentence_file.name)
+            os.remove(common_file.name)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import random
+import sys
+import unittest
+from collections import Counter
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from HeavyHitters import HeavyHitters
+
+
+class TestHeavyHitters(unittest.TestCase):
+
+    # Test that counts are exact when there are no more distinct items than the capacity.
+    def test_exact_within_capacity(self):
+        summary = HeavyHitters(3)
+        summary.update(["a", "b", "a", "c", "a", "b"])
+        self.assertEqual(summary.most_common(), [("a", 3), ("b", 2), ("c", 1)])
+        self.assertEqual(summary.most_common(2, min_count=2), [("a", 3), ("b", 2)])
+
+    # Test the error bound of the counts on a skewed random stream.
+    def test_error_bound(self):
+        random.seed(7)
+        stream = [int(random.paretovariate(1.2)) for _ in range(5000)]
+        summary = HeavyHitters(20)
+        summary.update(stream)
+        true_counts = Counter(stream)
+        for item, count in summary.counts.items():
+            self.assertGreaterEqual(count, true_counts[item])
+            self.assertLessEqual(count - true_counts[item], summary.errors[item])
+            self.assertLessEqual(summary.errors[item], summary.error_bound())
+        for item, count in true_counts.items():
+            if count > summary.error_bound():
+                self.assertIn(item, summary.counts)
+        self.assertLessEqual(len(summary.counts), 20)
+
+    # Test that the capacity must be positive.
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            HeavyHitters(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
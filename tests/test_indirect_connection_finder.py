@@ -6,6 +6,7 @@ import unittest
 from collections import deque
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from IndirectConnectionFinder import IndirectConnectionFinder
+from LruCache import LruCache
 from Node import Node
 from Person import Person
 
@@ -208,6 +209,25 @@ class TestIndirectConnectionFinder(unittest.TestCase):
         expected = {"Question 8": {"Pair Matches": expected_pairs}}
         self.assertEqual(output, expected)
 
+    # --- Test the result cache ---
+    def test_result_cache(self):
+        """
+        Repeated pairs are answered from the cache, and a new graph is never answered with results of the old one.
+        """
+        IndirectConnectionFinder.result_cache = LruCache()
+        try:
+            self.assertTrue(self.icf.persons_indirectly_connected("alice", "diana", 3))
+            self.assertTrue(self.icf.persons_indirectly_connected("alice", "diana", 3))
+            self.assertEqual((IndirectConnectionFinder.result_cache.hits,
+                              IndirectConnectionFinder.result_cache.misses), (1, 1))
+            # Without charlie <-> diana, alice and diana are no longer connected.
+            graph = dict(self.graph)
+            graph["charlie"] = [node for node in graph["charlie"] if node.payload is not self.diana]
+            self.icf.adjacency_list = graph
+            self.assertFalse(self.icf.persons_indirectly_connected("alice", "diana", 3))
+        finally:
+            IndirectConnectionFinder.result_cache = None
+
 
 if __name__ == '__main__':
     unittest.main()
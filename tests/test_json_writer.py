@@ -0,0 +1,31 @@
+import io
+import json
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from JsonWriter import JsonWriter
+
+
+class TestJsonWriter(unittest.TestCase):
+
+    # Test that the written document is the same as printing json.dumps of it.
+    def test_write_matches_json_dumps(self):
+        document = {"Question 1": {"Processed Sentences": [["a", "b"], [], ["café"]],
+                                   "Processed Names": [[["alice"], [["ally"], ["al"]]]],
+                                   "Empty": {}, "Value": None, "Count": 1.5}}
+        output = io.StringIO()
+        JsonWriter.write(document, output)
+        self.assertEqual(output.getvalue(), json.dumps(document) + "\n")
+
+    # Test that generators are written as arrays.
+    def test_write_generator(self):
+        document = {"Counts": [["1_seq", ([word, 1] for word in ["a", "b"])]]}
+        output = io.StringIO()
+        JsonWriter.write(document, output)
+        self.assertEqual(output.getvalue(), json.dumps({"Counts": [["1_seq", [["a", 1], ["b", 1]]]]}) + "\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from LruCache import LruCache
+
+
+# Test suite for the LRU cache of query results
+class TestLruCache(unittest.TestCase):
+
+    # Test that the least recently used entry is evicted and that lookups are counted.
+    def test_eviction_and_counters(self):
+        cache = LruCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # "b" is now the least recently used.
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.stats(), {"entries": 2, "size": 2, "hits": 2, "misses": 1, "evictions": 1})
+
+    # Test that with size_of the total size of the results is bounded, and results too large are not stored.
+    def test_size_of(self):
+        cache = LruCache(5, size_of=len)
+        cache.put("a", [1, 2])
+        cache.put("b", [1, 2, 3])
+        cache.put("c", [1])
+        self.assertEqual(list(cache.entries), ["b", "c"])
+        self.assertEqual((cache.size, cache.evictions), (4, 1))
+        cache.put("d", [1] * 6)
+        self.assertNotIn("d", cache.entries)
+        cache.put("c", [1, 2])
+        self.assertEqual(cache.size, 5)
+
+    # Test that a result is computed once, including results that are false.
+    def test_get_or_compute(self):
+        cache = LruCache()
+        calls = []
+        for _ in range(3):
+            self.assertFalse(cache.get_or_compute(("pair", 1), lambda: calls.append(1) or False))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    # Test that new versions are never reused and that the size must be positive.
+    def test_versions_and_size(self):
+        self.assertNotEqual(LruCache.new_version(), LruCache.new_version())
+        with self.assertRaises(ValueError):
+            LruCache(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
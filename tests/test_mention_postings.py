@@ -0,0 +1,55 @@
+import os
+import sys
+import tempfile
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from MentionPostings import MentionPostings
+from Person import Person
+from Sentence import Sentence
+
+
+# Test suite for MentionPostings
+class TestMentionPostings(unittest.TestCase):
+
+    def setUp(self):
+        self.persons = [Person("Alice", "Ally"), Person("Bob", ""), Person("Carol", "")]
+        for person in self.persons:
+            person.clean([])
+        self.sentences = [Sentence("Alice met Bob", []), Sentence("Nobody here", []),
+                          Sentence("Ally and Alice left", []), Sentence("Bob stayed", [])]
+        self.mention_postings = MentionPostings.build(iter(self.sentences), self.persons)
+
+    # Test that each person has the sorted sentences mentioning them and the mention counts.
+    def test_build(self):
+        self.assertEqual(len(self.mention_postings), 3)
+        self.assertEqual(list(self.mention_postings.get_sentence_indices(0)), [0, 2])
+        self.assertEqual(list(self.mention_postings.get_counts(0)), [1, 2])
+        self.assertEqual(self.mention_postings.total_mentions(0), 3)
+        self.assertEqual(list(self.mention_postings.get_sentence_indices(1)), [0, 3])
+        self.assertEqual(list(self.mention_postings.get_sentence_indices(2)), [])
+
+    # Test the windows of consecutive sentences containing a mention of the person.
+    def test_get_window_starts(self):
+        self.assertEqual(self.mention_postings.get_window_starts(0, 2, 4), {0, 1, 2})
+        self.assertEqual(self.mention_postings.get_window_starts(1, 3, 4), {0, 1})
+        self.assertEqual(self.mention_postings.get_window_starts(1, 5, 4), set())
+
+    # Test that the postings are read back as written.
+    def test_write_read(self):
+        descriptor, path = tempfile.mkstemp()
+        os.close(descriptor)
+        try:
+            self.mention_postings.write(path)
+            read_postings = MentionPostings.read(path)
+            for person_index in range(3):
+                self.assertEqual(list(read_postings.get_sentence_indices(person_index)),
+                                 list(self.mention_postings.get_sentence_indices(person_index)))
+                self.assertEqual(list(read_postings.get_counts(person_index)),
+                                 list(self.mention_postings.get_counts(person_index)))
+        finally:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
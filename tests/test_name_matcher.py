@@ -0,0 +1,53 @@
+import os
+import random
+import sys
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from NameMatcher import NameMatcher
+from Person import Person
+from Sentence import Sentence
+from Vocabulary import Vocabulary
+
+
+# Test suite for NameMatcher
+class TestNameMatcher(unittest.TestCase):
+
+    # Test that the mentions are counted like check_for_names, including nicknames inside words.
+    def test_count_mentions(self):
+        persons = [Person("Harry Potter", "Harry,Potter boy"), Person("Ron", "Ronnie,on"), Person("Ginny", "")]
+        for person in persons:
+            person.clean([])
+        sentence = Sentence("Harry Potter and Ron went on, Potter boy Ronnie said", unwanted_words=[])
+        matcher = NameMatcher(persons)
+        self.assertEqual(matcher.count_mentions(sentence),
+                         {index: sentence.check_for_names(person) for index, person in enumerate(persons)
+                          if sentence.check_for_names(person)})
+        self.assertEqual(matcher.count_mentions(sentence.word_list), matcher.count_mentions(sentence))
+
+    # Test random names and sentences against check_for_names, with overlapping and repeated nicknames. Sentences
+    # encoded in a vocabulary that keeps growing are matched by token ids and counted the same.
+    def test_matches_check_for_names(self):
+        random.seed(11)
+        words = ["a", "aa", "ab", "ba", "b", "aba"]
+        vocabulary = Vocabulary()
+        for _ in range(100):
+            persons = [Person(" ".join(random.sample(words, 2)), ",".join(random.choice(words) for _ in range(2)))
+                       for _ in range(4)]
+            for person in persons:
+                person.clean([])
+            matcher = NameMatcher(persons)
+            sentence = Sentence(" ".join(random.choice(words) for _ in range(8)), unwanted_words=[])
+            mentions = matcher.count_mentions(sentence)
+            for index, person in enumerate(persons):
+                self.assertEqual(mentions.get(index, 0), sentence.check_for_names(person))
+            encoded = Sentence(sentence.data, unwanted_words=[])
+            encoded.encode(vocabulary)
+            self.assertEqual(matcher.count_mentions(encoded), mentions)
+            for index, person in enumerate(persons):
+                self.assertEqual(encoded.check_for_names(person), mentions.get(index, 0))
+                self.assertEqual(encoded.check_if_person_in_sentence(person), index in mentions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -103,12 +103,12 @@ class TestPersonCounter(unittest.TestCase):
             os.remove(name_file)
             os.remove(common_file)
 
-    # Test count_person_appearances using temporary CSV files and overriding check_for_names.
+    # Test count_person_appearances using temporary CSV files.
     def test_count_person_appearances_with_temp_files(self):
         # Prepare CSV data for sentences.
         sentences_data = [
             ["sentence"],
-            ["Dummy sentence for counting."]
+            ["Alice, also known as Ally, went home."]
         ]
         # Prepare CSV data for names.
         names_data = [
@@ -133,9 +133,7 @@ class TestPersonCounter(unittest.TestCase):
             # Clean persons so that cleaned_data is set.
             for person in pc.persons:
                 person.clean([])
-            # Override check_for_names: simulate "alice" mentioned 2 times, "bob" 0 times.
-            for sentence in pc.sentences:
-                sentence.check_for_names = lambda person: 2 if person.real_name.cleaned_data == "alice" else 0
+            # "alice" is mentioned 2 times (real name and nickname), "bob" 0 times.
             json_output = pc.count_person_appearances()
             output = json.loads(json_output)
             expected = {"Question 3": {"Name Mentions": [["alice", 2]]}}
@@ -149,7 +147,7 @@ class TestPersonCounter(unittest.TestCase):
     def test_count_person_appearances_excludes_zero_mentions(self):
         sentences_data = [
             ["sentence"],
-            ["Dummy sentence for testing."]
+            ["Alice and Ally saw Charlie."]
         ]
         names_data = [
             ["Name"],
@@ -172,11 +170,7 @@ class TestPersonCounter(unittest.TestCase):
             )
             for person in pc.persons:
                 person.clean([])
-            # Override check_for_names:
             # "alice" appears 2 times, "charlie" 1 time, "bob" 0 times.
-            for sentence in pc.sentences:
-                sentence.check_for_names = lambda person: 2 if person.real_name.cleaned_data == "alice" \
-                    else (1 if person.real_name.cleaned_data == "charlie" else 0)
             json_output = pc.count_person_appearances()
             output = json.loads(json_output)
             expected = {"Question 3": {"Name Mentions": [["alice", 2], ["charlie", 1]]}}
@@ -0,0 +1,50 @@
+import os
+import random
+import sys
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Corpus import Corpus
+from PositionalIndex import PositionalIndex
+from Sentence import Sentence
+
+
+# Test suite for PositionalIndex
+class TestPositionalIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.sentences = [Sentence("Alice went home", unwanted_words=[]),
+                          Sentence("Bob went home went home", unwanted_words=[]),
+                          Sentence("Home Alice", unwanted_words=[])]
+        self.index = PositionalIndex.from_sentences(self.sentences)
+
+    # Test that every token has the sorted positions of its appearances.
+    def test_get_positions(self):
+        vocabulary = self.index.corpus.vocabulary
+        self.assertEqual(list(self.index.get_positions(vocabulary.get_id("home"))), [2, 5, 7, 8])
+        self.assertEqual(list(self.index.get_positions(vocabulary.get_id("bob"))), [3])
+
+    # Test phrase queries, which never match across sentences.
+    def test_find_positions(self):
+        self.assertEqual(self.index.find_positions(["went", "home"]), [1, 4, 6])
+        self.assertEqual(self.index.sentences_containing(["went", "home"]), [0, 1])
+        self.assertEqual(self.index.sentences_containing(["home", "bob"]), [])
+        self.assertEqual(self.index.sentences_containing(["home", "alice"]), [2])
+        self.assertEqual(self.index.sentences_containing(["carol"]), [])
+        self.assertEqual(self.index.sentences_containing([]), [])
+
+    # Test queries on random sentences, including empty ones, against a scan of the sentences.
+    def test_matches_scan(self):
+        random.seed(13)
+        for _ in range(50):
+            word_lists = [[random.choice(["a", "b", "c"]) for _ in range(random.randint(0, 5))]
+                          for _ in range(random.randint(1, 6))]
+            index = PositionalIndex(Corpus.from_word_lists(word_lists))
+            query = [random.choice(["a", "b", "c"]) for _ in range(random.randint(1, 3))]
+            expected = [i for i, words in enumerate(word_lists)
+                        if any(words[j:j + len(query)] == query for j in range(len(words)))]
+            self.assertEqual(index.sentences_containing(query), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
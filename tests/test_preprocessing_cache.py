@@ -0,0 +1,93 @@
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from MentionPostings import MentionPostings
+from PreprocessingCache import PreprocessingCache
+from Processor import Processor
+
+# --- Helper Functions ---
+
+def write_csv(file_name, rows):
+    # Writes the rows (first row is the header) to the CSV file.
+    with open(file_name, 'w', newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        for row in rows:
+            writer.writerow(row)
+
+# --- Test Suite for PreprocessingCache ---
+
+class TestPreprocessingCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = PreprocessingCache(os.path.join(self.directory, "cache"))
+        self.sentence_file = os.path.join(self.directory, "sentences.csv")
+        self.name_file = os.path.join(self.directory, "names.csv")
+        self.common_file = os.path.join(self.directory, "common.csv")
+        write_csv(self.sentence_file, [["sentence"], ["Harry met Ron."], ["The"], ["Ron smiled at Harry!"]])
+        write_csv(self.name_file, [["Name", "Other Names"], ["Harry Potter", "The Boy"], ["Harry Potter", ""]])
+        write_csv(self.common_file, [["words"], ["the"], ["at"]])
+
+    def tearDown(self):
+        Processor.cache = None
+        shutil.rmtree(self.directory)
+
+    # Test that the key depends on the file contents only.
+    def test_create_key(self):
+        key = PreprocessingCache.create_key(self.sentence_file, self.name_file, self.common_file)
+        copy = os.path.join(self.directory, "copy.csv")
+        shutil.copy(self.sentence_file, copy)
+        self.assertEqual(PreprocessingCache.create_key(copy, self.name_file, self.common_file), key)
+        write_csv(copy, [["sentence"], ["Something else"]])
+        self.assertNotEqual(PreprocessingCache.create_key(copy, self.name_file, self.common_file), key)
+        self.assertNotEqual(PreprocessingCache.create_key(self.sentence_file, None, self.common_file), key)
+
+    # Test that preprocessing with a cache stores the result once and then reads it back unchanged.
+    def test_preprocess_uses_cache(self):
+        expected = Processor.preprocess(self.sentence_file, self.name_file, self.common_file)
+        Processor.cache = self.cache
+        self.assertEqual(Processor.preprocess(self.sentence_file, self.name_file, self.common_file), expected)
+        key = PreprocessingCache.create_key(self.sentence_file, self.name_file, self.common_file)
+        self.assertEqual(self.cache.load(key), expected)
+        sentences, persons = Processor.load_from_cache(self.sentence_file, self.name_file, self.common_file)
+        self.assertEqual([sentence.word_list for sentence in sentences], expected[0])
+        self.assertEqual([person.real_name.cleaned_data for person in persons], ["harry potter"])
+        self.assertEqual(persons[0].return_nickname_list(), ["boy"])
+
+    # Test that the least recently used entries are evicted once the cache is over its size limit.
+    def test_evict(self):
+        self.cache.store("old", [["a"]], [])
+        self.cache.store("new", [["b"]], [])
+        past = time.time() - 100
+        os.utime(self.cache.get_path("old"), (past, past))
+        self.assertIsNotNone(self.cache.load("old"))  # Reading marks "old" as recently used.
+        os.utime(self.cache.get_path("new"), (past, past))
+        self.cache.max_bytes = os.path.getsize(self.cache.get_path("old"))
+        self.cache.evict()
+        self.assertIsNotNone(self.cache.load("old"))
+        self.assertIsNone(self.cache.load("new"))
+
+    # Test that the mention postings are stored under the key of the inputs and persons and reused.
+    def test_mention_postings_use_cache(self):
+        Processor.cache = self.cache
+        input_file_paths = (self.sentence_file, self.name_file, self.common_file)
+        sentences, persons = Processor.load_from_cache(*input_file_paths)
+        mention_postings = Processor.get_mention_postings(sentences, persons, input_file_paths)
+        key = MentionPostings.create_cache_key(self.cache.create_key(*input_file_paths), persons)
+        self.assertTrue(os.path.isfile(self.cache.get_path(key, PreprocessingCache.POSTINGS_SUFFIX)))
+        cached = Processor.get_mention_postings([], persons, input_file_paths)
+        self.assertEqual(list(cached.get_sentence_indices(0)), list(mention_postings.get_sentence_indices(0)))
+        self.assertEqual(list(cached.get_counts(0)), [1, 1])
+        # Other persons for the same files get their own postings.
+        reordered = Processor.get_mention_postings(sentences, persons[::-1], input_file_paths)
+        self.assertEqual(list(reordered.get_sentence_indices(len(persons) - 1)),
+                         list(mention_postings.get_sentence_indices(0)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import csv
+import io
 import json
 import os
 import sys
@@ -6,9 +7,11 @@ import tempfile
 import unittest
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from JsonWriter import JsonWriter
 from Processor import Processor
 from Person import Person
 from Sentence import Sentence
+from SentenceWindow import SentenceWindow
 from Data import Data
 
 # --- Helper Functions ---
@@ -77,6 +80,23 @@ class TestProcessor(unittest.TestCase):
         finally:
             os.remove(file_name)
 
+    # Test iterate_csv_file yields cleaned records lazily and iterate_sentences skips empty sentences
+    def test_iterate_csv_file(self):
+        rows = [
+            ["The first sentence."],
+            ["The"],
+            ["Another one!"]
+        ]
+        file_name = create_temp_csv("sentence", rows)
+        try:
+            records = Processor.iterate_csv_file(file_name, ["the"])
+            self.assertNotIsInstance(records, list)
+            self.assertEqual([sentence.cleaned_data for sentence in records], ["first sentence", "", "another one"])
+            sentences = Processor.iterate_sentences(file_name, ["the"])
+            self.assertEqual([sentence.word_list for sentence in sentences], [["first", "sentence"], ["another", "one"]])
+        finally:
+            os.remove(file_name)
+
     # Test that Processor.clean calls each object's clean method (Data cleaning)
     def test_clean_method(self):
         common_words = ["and", "the"]
@@ -88,6 +108,26 @@ class TestProcessor(unittest.TestCase):
         self.assertIsNotNone(data_obj.word_list)
         self.assertTrue(len(data_obj.sequence_list) > 0)
 
+    # Test that cleaning in worker processes gives the same results, in the same order, as cleaning serially
+    def test_clean_with_workers(self):
+        common_words = ["the"]
+        texts = ["The quick brown fox", "Jumped over the dog", "", "The end."]
+        serial = [Sentence(text, unwanted_words=None) for text in texts]
+        parallel = [Sentence(text, unwanted_words=None) for text in texts]
+        person = Person("The Boy Who Lived", "Harry,The Chosen One")
+        Processor.clean(serial, common_words)
+        Processor.clean(parallel + [person], common_words, workers=2)
+        self.assertEqual([s.word_list for s in parallel], [s.word_list for s in serial])
+        self.assertEqual(person.real_name.cleaned_data, "boy who lived")
+        self.assertEqual(person.return_nickname_list(), ["harry", "chosen one"])
+        rows = [[text] for text in texts]
+        file_name = create_temp_csv("sentence", rows)
+        try:
+            sentences = list(Processor.iterate_sentences(file_name, common_words, workers=2))
+            self.assertEqual([s.word_list for s in sentences], [s.word_list for s in serial if s.word_list])
+        finally:
+            os.remove(file_name)
+
     # Test remove_duplicate_names returns only the first occurrence of a duplicate Person
     def test_remove_duplicate_names(self):
         person1 = Person("Alice", "Ally")
@@ -99,27 +139,35 @@ class TestProcessor(unittest.TestCase):
         self.assertEqual(len(unique_persons), 1)
         self.assertEqual(unique_persons[0].real_name.cleaned_data, person1.real_name.cleaned_data)
 
-    # Test that remove_empty_sentences removes Sentence objects that are empty
+    # Test that remove_empty_sentences returns a new list without the empty Sentence objects, including adjacent ones
     def test_remove_empty_sentences(self):
         non_empty = Sentence("This is a sentence.", unwanted_words=None)
         empty_sentence = Sentence(",,,", unwanted_words=None)
+        other_empty_sentence = Sentence("...", unwanted_words=None)
         empty_sentence.clean([])
         self.assertTrue(empty_sentence.sentence_empty())
-        sentences = [non_empty, empty_sentence]
-        Processor.remove_empty_sentences(sentences)
+        sentences = [empty_sentence, other_empty_sentence, non_empty]
+        sentences = Processor.remove_empty_sentences(sentences)
         self.assertEqual(len(sentences), 1)
         self.assertFalse(sentences[0].sentence_empty())
 
-    # Test that clean_sentences cleans each Sentence and then removes empty ones
+    # Test that clean_sentences cleans each Sentence and then returns the non empty ones
     def test_clean_sentences(self):
         common_words = ["a", "an", "the"]
         s1 = Sentence("The quick brown fox", unwanted_words=None)
         s2 = Sentence("a an the", unwanted_words=None)
         sentences = [s1, s2]
-        Processor.clean_sentences(sentences, common_words)
+        sentences = Processor.clean_sentences(sentences, common_words)
         self.assertEqual(len(sentences), 1)
         self.assertFalse(sentences[0].sentence_empty())
 
+    # Test that clean_names cleans each Person and keeps the first Person of each cleaned name
+    def test_clean_names(self):
+        persons = [Person("Alice", "Ally"), Person("Bob", ""), Person("the Alice", "Alicia")]
+        unique_persons = Processor.clean_names(persons, ["the"])
+        self.assertEqual([person.real_name.cleaned_data for person in unique_persons], ["alice", "bob"])
+        self.assertIs(unique_persons[0], persons[0])
+
     # Test that output_to_json returns JSON with the expected structure.
     def test_output_to_json(self):
         sentences_rows = [
@@ -156,5 +204,55 @@ class TestProcessor(unittest.TestCase):
             os.remove(names_file)
             os.remove(common_file)
 
+    # Test that streaming preprocessing cleans the sentences as they are consumed and writes the same document.
+    def test_preprocess_streaming(self):
+        sentences_file = create_temp_csv("sentence", [["This is the first sentence."], ["The"], ["Second one."]])
+        names_file = create_temp_csv("Name", [["Alice", "Ally"], ["Bob", "Bobby"]])
+        common_file = create_temp_csv("common", [["is"], ["the"]])
+        try:
+            expected = Processor.preprocess(sentences_file, names_file, common_file)
+            processed_sentences, processed_names = Processor.preprocess(sentences_file, names_file, common_file,
+                                                                        streaming=True)
+            self.assertNotIsInstance(processed_sentences, list)
+            output = io.StringIO()
+            JsonWriter.write(Processor.create_document(processed_sentences, processed_names), output)
+            self.assertEqual(output.getvalue(), Processor.format_json(*expected) + "\n")
+        finally:
+            for path in (sentences_file, names_file, common_file):
+                os.remove(path)
+
+    # Test that appending to a preprocessed file adds the new sentences and only the names not already present.
+    def test_append_preprocessed(self):
+        preprocessed = {"Question 1": {"Processed Sentences": [["first", "sentence"]],
+                                       "Processed Names": [[["alice"], [["ally"]]]]}}
+        preprocessed_file = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8")
+        json.dump(preprocessed, preprocessed_file)
+        preprocessed_file.close()
+        sentences_file = create_temp_csv("sentence", [["Second sentence here."]])
+        names_file = create_temp_csv("Name", [["Alice", "Al"], ["Bob", "Bobby"]])
+        common_file = create_temp_csv("common", [["here"]])
+        try:
+            processed_sentences, processed_names = Processor.append_preprocessed(
+                preprocessed_file.name, sentences_file, names_file, common_file)
+            self.assertEqual(processed_sentences, [["first", "sentence"], ["second", "sentence"]])
+            self.assertEqual(processed_names, [[["alice"], [["ally"]]], [["bob"], [["bobby"]]]])
+        finally:
+            for path in (preprocessed_file.name, sentences_file, names_file, common_file):
+                os.remove(path)
+
+    # Test that set_mentions finds the persons of every sentence and that the sentence and window lookups use them.
+    def test_set_mentions(self):
+        persons = [Person("Alice", "Ally"), Person("Bob", "")]
+        for person in persons:
+            person.clean([])
+        sentences = [Sentence("Ally met Bob", []), Sentence("Nobody here", [])]
+        sentences = Processor.set_mentions(iter(sentences), persons)
+        self.assertEqual(sentences[0].mentions, frozenset(persons))
+        self.assertEqual(sentences[1].mentions, frozenset())
+        self.assertTrue(sentences[0].check_if_person_in_sentence(persons[0]))
+        self.assertFalse(sentences[1].check_if_person_in_sentence(persons[1]))
+        self.assertTrue(SentenceWindow(sentences).find_person_in_window(persons[1]))
+        self.assertFalse(SentenceWindow(sentences[1:]).find_person_in_window(persons[0]))
+
 if __name__ == '__main__':
     unittest.main()
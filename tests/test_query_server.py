@@ -0,0 +1,80 @@
+import asyncio
+import csv
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from QueryServer import QueryServer
+from SearchEngine import SearchEngine
+
+
+# Test suite for the query server of Tasks 4 and 7
+class TestQueryServer(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        sentence_file = os.path.join(self.temp_dir.name, "sentences.csv")
+        remove_file = os.path.join(self.temp_dir.name, "remove.csv")
+        with open(sentence_file, 'w', newline='', encoding='utf-8') as file:
+            csv.writer(file).writerows([["sentence"], ["Harry met Ron."], ["Ron smiled."]])
+        with open(remove_file, 'w', newline='', encoding='utf-8') as file:
+            csv.writer(file).writerows([["common"], ["a"]])
+        self.engine = SearchEngine(None, False, sentence_file, remove_file)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    # Test that a request is answered with the document of a query file with the same keys.
+    def test_handle_request(self):
+        server = QueryServer(search_engine=self.engine)
+        keys = [["ron"], ["harry", "met"]]
+        response = server.handle_request(json.dumps({"task": 4, "keys": keys}))
+        self.assertEqual(response, self.engine.build_dict(keys))
+        self.assertEqual(server.handle_request(json.dumps({"keys": keys})), response)
+        self.assertEqual(json.loads(server.handle_request("not json")), {"error": "invalid input"})
+        self.assertEqual(json.loads(server.handle_request(json.dumps({"task": 7, "keys": []}))),
+                         {"error": "invalid input"})
+
+    # Test that pair requests reach the connection finder with their maximal distance.
+    def test_pair_request(self):
+        connection_finder = Mock()
+        connection_finder.find_indirect_connections.return_value = "{}"
+        server = QueryServer(search_engine=self.engine, connection_finder=connection_finder)
+        server.handle_request(json.dumps({"task": 7, "keys": [["harry", "ron"]], "maximal_distance": 2}))
+        connection_finder.find_indirect_connections.assert_called_once_with([["harry", "ron"]], 2)
+        self.assertEqual(json.loads(server.handle_request(json.dumps({"keys": []}))), {"error": "invalid input"})
+
+    # Test that concurrent clients each get the answers to their own requests, in order.
+    def test_concurrent_clients(self):
+        server = QueryServer(search_engine=self.engine)
+        queries = [[["ron"]], [["harry", "met"]], [["smiled"]], [["dobby"]]]
+
+        async def client(port, keys_list):
+            reader, writer = await asyncio.open_connection(QueryServer.DEFAULT_HOST, port)
+            responses = []
+            for keys in keys_list:
+                writer.write((json.dumps({"keys": keys}) + "\n").encode("utf-8"))
+                await writer.drain()
+                responses.append((await reader.readline()).decode("utf-8").rstrip("\n"))
+            writer.close()
+            await writer.wait_closed()
+            return responses
+
+        async def run():
+            tcp_server = await server.start()
+            port = tcp_server.sockets[0].getsockname()[1]
+            async with tcp_server:
+                return await asyncio.gather(client(port, queries), client(port, queries[::-1]))
+
+        first, second = asyncio.run(run())
+        expected = [self.engine.build_dict(keys) for keys in queries]
+        self.assertEqual(first, expected)
+        self.assertEqual(second, expected[::-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Corpus import Corpus
+from PositionalIndex import PositionalIndex
+from QueryTrie import QueryTrie
+
+
+# Test suite for the trie of a batch of sequence queries
+class TestQueryTrie(unittest.TestCase):
+
+    def setUp(self):
+        self.corpus = Corpus.from_word_lists([["harry", "met", "ron"], ["ron", "met", "harry", "met", "ron"],
+                                              ["hermione", "read"], []])
+
+    # Test that every query gets the sentences an index lookup finds, with prefixes and duplicates in the batch.
+    def test_match(self):
+        queries = [["harry"], ["harry", "met"], ["harry", "met", "ron"], ["met", "ron"], ["ron", "hermione"],
+                   ["harry", "met"], ["dobby"], [], ["read"]]
+        index = PositionalIndex(self.corpus)
+        matches = QueryTrie(self.corpus.vocabulary, queries).match(self.corpus)
+        self.assertEqual(matches, [index.sentences_containing(words) for words in queries])
+        self.assertEqual(matches[2], [0, 1])
+
+    # Test that a corpus slice is matched with its own sentence indices.
+    def test_match_slice(self):
+        self.assertEqual(QueryTrie(self.corpus.vocabulary, [["ron"]]).match(self.corpus[1:]), [[0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,6 +7,7 @@ import unittest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from PositionalIndex import PositionalIndex
 from SearchEngine import SearchEngine
 from Processor import Processor
 from Sentence import Sentence
@@ -157,6 +158,43 @@ class TestSearchEngine(unittest.TestCase):
         finally:
             json_manager.load_json_file = orig_load
 
+    # Test that a batch of sequences found in one scan gives the same result as one lookup per sequence.
+    def test_build_dict_batch(self):
+        sentence_file = create_temp_csv([["sentence"], ["Harry met Ron."], ["Ron met Harry, then met Ron again."],
+                                         ["Hermione read."]])
+        common_file = create_temp_csv([["common"], ["then"]])
+        try:
+            engine = SearchEngine(None, False, sentence_file, common_file)
+            keys = [["harry", "met"], ["met", "ron"], ["ron"], ["harry", "met"], ["dobby"], ["read"]]
+            result = engine.build_dict(keys, batch=True)
+            self.assertEqual(result, engine.build_dict(keys, batch=False))
+            self.assertEqual(json.loads(result)["Question 4"]["K-Seq Matches"][0],
+                             ["harry met", [["harry", "met", "ron"], ["ron", "met", "harry", "met", "ron", "again"]]])
+        finally:
+            os.remove(sentence_file)
+            os.remove(common_file)
+
+    # Test that repeated sequences are answered from the result cache, but not for another engine's sentences.
+    def test_result_cache(self):
+        sentence_file = create_temp_csv([["sentence"], ["Harry met Ron."], ["Ron smiled."]])
+        common_file = create_temp_csv([["common"], ["a"]])
+        SearchEngine.result_cache = SearchEngine.create_result_cache()
+        try:
+            engine = SearchEngine(None, False, sentence_file, common_file)
+            self.assertEqual(len(engine.find_matching_sentences("ron")), 2)
+            self.assertEqual(len(engine.find_matching_sentences("ron")), 2)
+            engine.build_dict([["ron"], ["smiled"]], batch=True)
+            self.assertEqual(SearchEngine.result_cache.stats(),
+                             {"entries": 2, "size": 5, "hits": 2, "misses": 2, "evictions": 0})
+            other_engine = SearchEngine(None, False, sentence_file, common_file)
+            other_engine.sentences = other_engine.sentences[:1]
+            other_engine.index = PositionalIndex.from_sentences(other_engine.sentences)
+            self.assertEqual(len(other_engine.find_matching_sentences("ron")), 1)
+        finally:
+            SearchEngine.result_cache = None
+            os.remove(sentence_file)
+            os.remove(common_file)
+
 
 if __name__ == '__main__':
     unittest.main()
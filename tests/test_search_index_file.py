@@ -0,0 +1,112 @@
+import csv
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Corpus import Corpus
+from PositionalIndex import PositionalIndex
+from PreprocessingCache import PreprocessingCache
+from SearchEngine import SearchEngine
+from SearchIndexFile import SearchIndexFile
+
+
+# Test suite for the saved positional index of Task 4
+class TestSearchIndexFile(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.index_path = os.path.join(self.temp_dir.name, "sentences.index")
+        self.sentences = [["harry", "met", "ron"], ["ron", "smiled"], ["harry", "met", "hermione"]]
+        self.corpus_hash = "ab" * 32
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def create_file(self, name, rows):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            csv.writer(file).writerows(rows)
+        return path
+
+    # Test that the index read back answers queries like the index written.
+    def test_write_read(self):
+        index = PositionalIndex(Corpus.from_word_lists(self.sentences))
+        SearchIndexFile.write(self.index_path, index, self.corpus_hash)
+        loaded = SearchIndexFile.read(self.index_path, self.corpus_hash)
+        self.assertEqual(loaded.corpus.word_lists(), self.sentences)
+        for words in (["harry", "met"], ["ron"], ["met", "ron", "smiled"], ["dobby"]):
+            self.assertEqual(loaded.sentences_containing(words), index.sentences_containing(words))
+        loaded.close()
+
+    # Test that a corpus slice is written with positions counted from its own first token.
+    def test_write_slice(self):
+        index = PositionalIndex(Corpus.from_word_lists(self.sentences)[1:])
+        SearchIndexFile.write(self.index_path, index, self.corpus_hash)
+        loaded = SearchIndexFile.read(self.index_path, self.corpus_hash)
+        self.assertEqual(loaded.sentences_containing(["harry", "met"]), [1])
+        loaded.close()
+
+    # Test that an index of other inputs is not used, and that other files are not taken for an index.
+    def test_read_stale(self):
+        self.assertIsNone(SearchIndexFile.read(self.index_path, self.corpus_hash))
+        SearchIndexFile.write(self.index_path, PositionalIndex(Corpus.from_word_lists(self.sentences)),
+                              self.corpus_hash)
+        self.assertIsNone(SearchIndexFile.read(self.index_path, "cd" * 32))
+        other_path = self.create_file("other.csv", [["sentence"]] * 20)
+        with self.assertRaises(ValueError):
+            SearchIndexFile.read(other_path, self.corpus_hash)
+        short_path = self.create_file("short.csv", [["sentence"]])
+        with self.assertRaises(ValueError):
+            SearchIndexFile.read(short_path, self.corpus_hash)
+
+    # Test that closing the index unmaps its file, so it can be written again.
+    def test_close(self):
+        SearchIndexFile.write(self.index_path, PositionalIndex(Corpus.from_word_lists(self.sentences)),
+                              self.corpus_hash)
+        with SearchIndexFile(self.index_path) as index_file:
+            self.assertEqual(index_file.corpus_hash, self.corpus_hash)
+            self.assertEqual(index_file.index.sentences_containing(["ron"]), [0, 1])
+        self.assertTrue(index_file.mapping.closed)
+        loaded = SearchIndexFile.read(self.index_path, self.corpus_hash)
+        loaded.close()
+        self.assertTrue(loaded.index_file.mapping.closed)
+        SearchIndexFile.write(self.index_path, PositionalIndex(Corpus.from_word_lists(self.sentences[:1])),
+                              self.corpus_hash)
+        loaded = SearchIndexFile.read(self.index_path, self.corpus_hash)
+        self.assertEqual(loaded.sentences_containing(["ron"]), [0])
+        loaded.close()
+
+    # Test that the engine builds the index once and then answers from the saved index until the inputs change.
+    def test_search_engine_reuses_index(self):
+        sentence_file = self.create_file("sentences.csv", [["sentence"], ["Harry met Ron."], ["Ron smiled."]])
+        remove_file = self.create_file("remove.csv", [["common"], ["a"]])
+        query_file = os.path.join(self.temp_dir.name, "query.json")
+        with open(query_file, 'w') as file:
+            json.dump({"keys": [["harry", "met"], ["ron"]]}, file)
+
+        engine = SearchEngine(query_file, False, sentence_file, remove_file, search_index_path=self.index_path)
+        expected = engine.build_dict()
+        self.assertEqual(json.loads(expected)["Question 4"]["K-Seq Matches"],
+                         [["harry met", [["harry", "met", "ron"]]], ["ron", [["harry", "met", "ron"], ["ron", "smiled"]]]])
+        with patch.object(SearchEngine, "load_sentences") as load_sentences:
+            engine = SearchEngine(query_file, False, sentence_file, remove_file, search_index_path=self.index_path)
+            load_sentences.assert_not_called()
+        self.assertEqual(engine.build_dict(), expected)
+        engine.index.close()  # The index file is rewritten below.
+
+        with open(sentence_file, 'a', newline='', encoding='utf-8') as file:
+            csv.writer(file).writerow(["Harry met Hermione."])
+        engine = SearchEngine(query_file, False, sentence_file, remove_file, search_index_path=self.index_path)
+        self.assertEqual(len(json.loads(engine.build_dict())["Question 4"]["K-Seq Matches"][0][1]), 2)
+        engine.index.close()
+        loaded = SearchIndexFile.read(self.index_path, PreprocessingCache.create_key(sentence_file, None, remove_file))
+        self.assertIsNotNone(loaded)
+        loaded.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
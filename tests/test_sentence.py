@@ -6,7 +6,7 @@ import csv
 import json
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from Sentence import Sentence
+from Sentence import CompactSentence, Sentence
 from Person import Person
 
 # Helper function to create temporary CSV files
@@ -55,6 +55,30 @@ class TestSentence(unittest.TestCase):
         self.assertFalse(s1.sentence_is_similar(s2, threshold=3))
         s3 = Sentence("Jumped over the lazy dog", unwanted_words=["the"])
         self.assertFalse(s1.sentence_is_similar(s3, threshold=1))
+    # Test that sequences are only generated on access and are bounded by max_sequence_length.
+    def test_sequence_list_is_lazy_and_bounded(self):
+        s = Sentence("a b c", unwanted_words=[])
+        self.assertIsNone(s._sequence_list)
+        self.assertEqual(s.sequence_list, ["a", "b", "c", "a b", "b c", "a b c"])
+        s.set_max_sequence_length(2)
+        self.assertEqual(s.sequence_list, ["a", "b", "c", "a b", "b c"])
+        self.assertEqual(list(s.iterate_sequences(1)), ["a", "b", "c"])
+
+    # Test that contains_sequence finds sequences of any length without building the full sequence list.
+    def test_contains_sequence(self):
+        s = Sentence("The quick brown fox", unwanted_words=[])
+        self.assertTrue(s.contains_sequence("quick brown fox"))
+        self.assertFalse(s.contains_sequence("brown quick"))
+        self.assertIsNone(s._sequence_list)
+    # Test that compact sentences have no __dict__, drop their source string and can still be cleaned again.
+    def test_compact_sentence(self):
+        s = CompactSentence("The quick brown fox", unwanted_words=[])
+        self.assertFalse(hasattr(s, "__dict__"))
+        self.assertIsNone(s.data)
+        self.assertEqual(s.word_list, ["the", "quick", "brown", "fox"])
+        s.clean(["the"])
+        self.assertEqual(s.cleaned_data, "quick brown fox")
+        self.assertEqual(Sentence("The quick brown fox", unwanted_words=[]).data, "The quick brown fox")
 
 if __name__ == '__main__':
     unittest.main()
@@ -8,6 +8,7 @@ import unittest
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from SentenceGrouper import SentenceGrouper
+from PreprocessingCache import PreprocessingCache
 from Processor import Processor
 from Node import Node
 
@@ -151,6 +152,26 @@ class TestSentenceGrouper(unittest.TestCase):
         self.assertEqual(output, expected_output)
         os.remove(preproc_file)
 
+    # Test that a preprocessing cache doesn't change the groups, sentences left empty by cleaning included.
+    def test_groups_with_cache(self):
+        sentence_file = create_temp_csv([["sentence"], ["Harry met Ron"], ["the"], ["Ron met Harry"]])
+        remove_file = create_temp_csv([["common"], ["the"]])
+        cache_dir = tempfile.TemporaryDirectory()
+        try:
+            sg = SentenceGrouper(False, 1, sentence_file=sentence_file, words_to_remove_file_path=remove_file)
+            expected = sg.return_groups(sg.find_interconnected_groups())
+            self.assertIn(["Group 1", [[]]], json.loads(expected)["Question 9"]["group Matches"])
+            Processor.cache = PreprocessingCache(cache_dir.name)
+            for _ in range(2):  # Cold and warm cache.
+                Processor.preprocess(sentence_file, None, remove_file)
+                sg = SentenceGrouper(False, 1, sentence_file=sentence_file, words_to_remove_file_path=remove_file)
+                self.assertEqual(sg.return_groups(sg.find_interconnected_groups()), expected)
+        finally:
+            Processor.cache = None
+            cache_dir.cleanup()
+            os.remove(sentence_file)
+            os.remove(remove_file)
+
 
 if __name__ == '__main__':
     unittest.main()
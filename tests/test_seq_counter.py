@@ -4,8 +4,11 @@ import os
 import sys
 import tempfile
 import unittest
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Corpus import Corpus
+from JsonWriter import JsonWriter
 from SequenceCounter import SequenceCounter
 from Sentence import Sentence
 from Processor import Processor
@@ -74,6 +77,57 @@ class TestSequenceCounter(unittest.TestCase):
         expected_seq_list = [["a", 2], ["b", 2], ["c", 1]]
         self.assertEqual(seq_list, expected_seq_list)
 
+    # Test that counting from a stream gives the same output as create_final_dictionary and reads sentences once.
+    def test_create_final_dictionary_from_stream(self):
+        sentences = [Sentence("a b a b", unwanted_words=[]), Sentence("b a", unwanted_words=[])]
+        expected = SequenceCounter.create_final_dictionary(3, sentences)
+        self.assertEqual(SequenceCounter.create_final_dictionary_from_stream(3, iter(sentences)), expected)
+        self.assertEqual(SequenceCounter.create_final_dictionary_from_stream(3, [["a", "b", "a", "b"], ["b", "a"]]),
+                         expected)
+        # A corpus is counted by token ids.
+        corpus = Corpus.from_word_lists([["a", "b", "a", "b"], ["b", "a"]])
+        self.assertEqual(SequenceCounter.create_final_dictionary_from_stream(3, corpus), expected)
+
+    # Test that counting in worker processes gives the same output.
+    def test_create_final_dictionary_in_parallel(self):
+        sentences = [["a", "b", "a", "b"], ["b", "a"], [], ["c", "a", "b"]] * 5
+        expected = SequenceCounter.create_final_dictionary_from_stream(3, sentences, workers=1)
+        with patch.object(SequenceCounter, "CHUNK_SIZE", 3):
+            self.assertEqual(SequenceCounter.create_final_dictionary_from_stream(3, iter(sentences), workers=2),
+                             expected)
+
+    # Test that counting with the counts spilled to disk gives the same output.
+    def test_create_final_dictionary_out_of_core(self):
+        sentences = [["a", "b", "a", "b"], ["b", "a"], [], ["c", "a", "b"]] * 3
+        expected = SequenceCounter.create_final_dictionary_from_stream(3, sentences, workers=1)
+        for spill_threshold in (1, 5, 100):
+            document = SequenceCounter.create_final_document_from_stream(3, iter(sentences), workers=1,
+                                                                         spill_threshold=spill_threshold)
+            self.assertEqual("".join(JsonWriter.iterate_json(document)), expected)
+
+    # Test that runs above the merge fan-in are merged in passes and that every run file is removed.
+    def test_out_of_core_merge_passes(self):
+        sentences = [["a", "b", "a", "b"], ["b", "a"], [], ["c", "a", "b"], ["d"]] * 5
+        expected = SequenceCounter.create_final_dictionary_from_stream(3, sentences, workers=1)
+        temp_dir = tempfile.mkdtemp()
+        try:
+            with patch.object(SequenceCounter, "MAX_MERGE_RUNS", 3), patch.object(tempfile, "tempdir", temp_dir):
+                document = SequenceCounter.create_final_document_from_stream(3, iter(sentences), workers=1,
+                                                                             spill_threshold=1)
+                self.assertEqual("".join(JsonWriter.iterate_json(document)), expected)
+            self.assertEqual(os.listdir(temp_dir), [])
+        finally:
+            os.rmdir(temp_dir)
+
+    # Test that the approximate counts keep only the most common sequences of each length.
+    def test_create_top_document_from_stream(self):
+        sentences = [["a", "b", "a", "b"], ["b", "a"], ["c"]]
+        document = SequenceCounter.create_top_document_from_stream(2, iter(sentences), top_k=2)
+        self.assertEqual(document, {"Question 2": {"2-Seq Counts": [["1_seq", [["a", 3], ["b", 3]]],
+                                                                    ["2_seq", [["a b", 2], ["b a", 2]]]]}})
+        document = SequenceCounter.create_top_document_from_stream(2, sentences, min_count=3)
+        self.assertEqual(document["Question 2"]["2-Seq Counts"], [["1_seq", [["a", 3], ["b", 3]]], ["2_seq", []]])
+
     # Test that the constructor loads data from a preprocessed JSON when the flag is True.
     def test_init_preprocessed_true(self):
         s1 = Sentence("hello world", unwanted_words=[])
@@ -97,7 +151,7 @@ class TestSequenceCounter(unittest.TestCase):
         orig_read_csv = Processor.read_csv_file
         orig_clean_sentences = Processor.clean_sentences
         Processor.read_csv_file = lambda file_path, unwanted_words=None: dummy_sentences if "sentence" in file_path else dummy_common
-        Processor.clean_sentences = lambda sentences, common_words: None
+        Processor.clean_sentences = lambda sentences, common_words: sentences
         try:
             sc = SequenceCounter(preprocessed_flag=False, sentence_file="sentences.csv", words_to_remove_file_path="common.csv")
             self.assertEqual(sc.sentences, dummy_sentences)
@@ -0,0 +1,69 @@
+import os
+import random
+import sys
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Corpus import Corpus
+from SequenceCounter import SequenceCounter
+from Sentence import Sentence
+from SuffixArray import SuffixArray
+
+
+# Test suite for SuffixArray
+class TestSuffixArray(unittest.TestCase):
+
+    def setUp(self):
+        self.sentences = [Sentence("Alice went home", unwanted_words=[]),
+                          Sentence("Bob went home", unwanted_words=[]),
+                          Sentence("Alice and Bob went home", unwanted_words=[])]
+        self.suffix_array = SuffixArray.from_sentences(self.sentences)
+
+    # Test that the counts match counting every sequence and never cross sentences.
+    def test_sequence_counts(self):
+        counts = self.suffix_array.sequence_counts(3)
+        self.assertEqual(counts[2], [["alice and", 1], ["alice went", 1], ["and bob", 1], ["bob went", 2],
+                                     ["went home", 3]])
+        self.assertEqual(counts[3], [["alice and bob", 1], ["alice went home", 1], ["and bob went", 1],
+                                     ["bob went home", 2]])
+
+    # Test that the distinct sequences are listed sorted as lists of words.
+    def test_iterate_distinct_sequences(self):
+        self.assertEqual(list(self.suffix_array.iterate_distinct_sequences(2)),
+                         [["alice"], ["alice", "and"], ["alice", "went"], ["and"], ["and", "bob"], ["bob"],
+                          ["bob", "went"], ["home"], ["went"], ["went", "home"]])
+
+    # Test that the distinct sequences of some of the sentences are the ones of a suffix array of only them.
+    def test_iterate_distinct_sequences_of(self):
+        random.seed(7)
+        for _ in range(50):
+            word_lists = [[random.choice(["a", "ab", "b", "c"]) for _ in range(random.randint(0, 6))]
+                          for _ in range(random.randint(1, 6))]
+            suffix_array = SuffixArray(Corpus.from_word_lists(word_lists))
+            indices = sorted(random.sample(range(len(word_lists)), random.randint(0, len(word_lists))))
+            expected = SuffixArray(Corpus.from_word_lists([word_lists[i] for i in indices]))
+            self.assertEqual(list(suffix_array.iterate_distinct_sequences_of(indices, 3)),
+                             list(expected.iterate_distinct_sequences(3)))
+
+    # Test finding the sentences containing a sequence.
+    def test_sentences_containing(self):
+        self.assertEqual(self.suffix_array.sentences_containing(["went", "home"]), [0, 1, 2])
+        self.assertEqual(self.suffix_array.sentences_containing(["bob", "went"]), [1, 2])
+        self.assertEqual(self.suffix_array.sentences_containing(["home", "bob"]), [])
+        self.assertEqual(self.suffix_array.sentences_containing(["carol"]), [])
+        self.assertEqual(self.suffix_array.sentences_containing([]), [])
+
+    # Test the counts against the counters on random sentences, including empty ones.
+    def test_matches_sequence_counter(self):
+        random.seed(5)
+        for _ in range(50):
+            word_lists = [[random.choice(["a", "ab", "b", "c"]) for _ in range(random.randint(0, 6))]
+                          for _ in range(random.randint(0, 6))]
+            suffix_array = SuffixArray(Corpus.from_word_lists(word_lists))
+            expected = SequenceCounter.count_sequences_in_stream(4, word_lists)
+            self.assertEqual(suffix_array.sequence_counts(4),
+                             {length: SequenceCounter.turn_dict_to_list(counts) for length, counts in expected.items()})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Data import Data
+from TextCleaner import TextCleaner
+
+
+# Test suite for TextCleaner
+class TestTextCleaner(unittest.TestCase):
+
+    # Test that tokenize lowercases, removes punctuation and drops unwanted words in one pass.
+    def test_tokenize(self):
+        cleaner = TextCleaner(["the", "a"])
+        self.assertEqual(cleaner.tokenize("The quick, brown-fox jumped over a   dog!"),
+                         ["quick", "brown", "fox", "jumped", "over", "dog"])
+        self.assertEqual(cleaner.tokenize(" ,,, "), [])
+
+    # Test that clean returns the same string as the step by step Data cleaning functions.
+    def test_clean_matches_data_cleaning_steps(self):
+        text = "  Harry's WAND, (and) the   Snitch... 42 times!  "
+        unwanted_words = ["and", "the"]
+        data = Data(text)
+        data.convert_to_lowercase()
+        data.remove_punctuation()
+        data.remove_unwanted_words(unwanted_words)
+        data.remove_consecutive_whitespaces()
+        data.remove_whitespace_suffix_and_prefix()
+        self.assertEqual(TextCleaner(unwanted_words).clean(text), data.cleaned_data)
+
+    # Test that create reuses an existing cleaner and builds one from a list of words otherwise.
+    def test_create(self):
+        cleaner = TextCleaner(["the"])
+        self.assertIs(TextCleaner.create(cleaner), cleaner)
+        self.assertEqual(TextCleaner.create(["the"]).unwanted_words, frozenset(["the"]))
+        self.assertEqual(TextCleaner.create(None).unwanted_words, frozenset())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Processor import Processor
+from Sentence import Sentence
+from Vocabulary import Vocabulary
+
+
+# Test suite for Vocabulary and encoded sentences
+class TestVocabulary(unittest.TestCase):
+
+    # Test that intern gives each new token the next id and returns the same id for known tokens.
+    def test_intern(self):
+        vocabulary = Vocabulary()
+        self.assertEqual(vocabulary.intern("harry"), 0)
+        self.assertEqual(vocabulary.intern("ron"), 1)
+        self.assertEqual(vocabulary.intern("harry"), 0)
+        self.assertEqual(len(vocabulary), 2)
+        self.assertEqual(vocabulary.get_id("hermione"), -1)
+
+    # Test that decode reverses encode.
+    def test_encode_decode(self):
+        vocabulary = Vocabulary(["a"])
+        token_ids = vocabulary.encode(["b", "a", "b"])
+        self.assertEqual(list(token_ids), [1, 0, 1])
+        self.assertEqual(vocabulary.decode(token_ids), ["b", "a", "b"])
+
+    # Test that encoded sentences keep only token ids and still expose their words and sequences.
+    def test_encoded_sentence(self):
+        s1 = Sentence("Harry met Ron, Harry smiled", unwanted_words=[])
+        s2 = Sentence("Ron smiled at Hermione", unwanted_words=[])
+        vocabulary = Processor.encode([s1, s2])
+        self.assertIsNone(s1._word_list)
+        self.assertEqual(s1.word_list, ["harry", "met", "ron", "harry", "smiled"])
+        self.assertEqual(s1.cleaned_data, "harry met ron harry smiled")
+        self.assertEqual(s1.create_sequence_list(2)[0], "harry met")
+        self.assertEqual(len(vocabulary), 6)
+        self.assertTrue(s1.sentence_is_similar(s2, 2))
+        self.assertFalse(s1.sentence_is_similar(s2, 3))
+
+if __name__ == '__main__':
+    unittest.main()